@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from localization import atomic_write
+
+# Snapshots of unsaved edits live here, next to en.json
+AUTOSAVE_DIR = 'autosave'
+# Snapshots kept per language file; a crash while writing one still leaves the others
+AUTOSAVE_SNAPSHOTS = 3
+_UNSAFE = re.compile(r'[^\w.-]+')
+
+
+def snapshot_prefix(name, path):
+    """File name prefix of the snapshots of one language column"""
+    digest = hashlib.blake2b(os.path.abspath(path).encode('utf-8') if path else b'', digest_size=4).hexdigest()
+    return f"{_UNSAFE.sub('_', name)}-{digest}."
+
+
+class Autosaver:
+    """Writes the unsaved edits of language columns as rotating snapshots on a background thread.
+
+    A snapshot holds only the keys edited since the file was last saved, so
+    writing one costs the same however large the file is. Snapshots go to
+    numbered slots in turn, each written to a temporary file and swapped in.
+    Only the newest snapshot waiting for a column is written.
+    """
+
+    def __init__(self, folder, keep=AUTOSAVE_SNAPSHOTS):
+        self.folder = folder
+        self.keep = keep
+        self.pending = {}
+        self.sequences = {}
+        self.condition = threading.Condition()
+        # Held while a snapshot is written, so discard() never races a write
+        self.write_lock = threading.Lock()
+        self.busy = False
+        self.thread = None
+        self.written = 0
+
+    def submit(self, name, path, edits):
+        """Queue a snapshot of {key: translation} edits to the file at path (None if not saved yet)"""
+        prefix = snapshot_prefix(name, path)
+        with self.condition:
+            self.pending[prefix] = {'name': name, 'path': path, 'time': time.time(), 'edits': edits}
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, daemon=True, name='autosave')
+                self.thread.start()
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.pending:
+                    self.busy = False
+                    self.condition.notify_all()
+                    self.condition.wait()
+                self.busy = True
+                prefix, snapshot = self.pending.popitem()
+                # Taken before pending is unlocked, so discard() waits for this write
+                self.write_lock.acquire()
+            try:
+                self._write(prefix, snapshot)
+            except Exception as e:
+                print(f"Autosave failed: {str(e)}")
+            finally:
+                self.write_lock.release()
+
+    def _write(self, prefix, snapshot):
+        os.makedirs(self.folder, exist_ok=True)
+        sequence = self.sequences.get(prefix)
+        if sequence is None:
+            sequence = max((existing['sequence'] for existing in self._load(prefix)), default=-1)
+        sequence += 1
+        snapshot['sequence'] = sequence
+        with atomic_write(os.path.join(self.folder, f'{prefix}{sequence % self.keep}.json')) as f:
+            json.dump(snapshot, f, ensure_ascii=False)
+        self.sequences[prefix] = sequence
+        self.written += 1
+
+    def _load(self, prefix):
+        snapshots = []
+        try:
+            file_names = os.listdir(self.folder)
+        except OSError:
+            return snapshots
+        for file_name in file_names:
+            if file_name.startswith(prefix) and file_name.endswith('.json'):
+                try:
+                    with open(os.path.join(self.folder, file_name), 'r', encoding='utf-8') as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return snapshots
+
+    def flush(self, timeout=5.0):
+        """Wait until every queued snapshot is written, e.g. before the app quits"""
+        with self.condition:
+            self.condition.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def discard(self, name, path):
+        """Forget the snapshots of a column, e.g. once it was saved"""
+        prefix = snapshot_prefix(name, path)
+        with self.condition:
+            self.pending.pop(prefix, None)
+        with self.write_lock:
+            self.sequences.pop(prefix, None)
+            for slot in range(self.keep):
+                try:
+                    os.remove(os.path.join(self.folder, f'{prefix}{slot}.json'))
+                except FileNotFoundError:
+                    pass
+
+
+def load_snapshots(folder):
+    """Newest readable snapshot of each column in folder, oldest first"""
+    newest = {}
+    try:
+        file_names = sorted(os.listdir(folder))
+    except OSError:
+        return []
+    for file_name in file_names:
+        if not file_name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(folder, file_name), 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        prefix = snapshot_prefix(snapshot.get('name', ''), snapshot.get('path'))
+        if prefix not in newest or snapshot.get('sequence', 0) > newest[prefix].get('sequence', 0):
+            newest[prefix] = snapshot
+    return sorted(newest.values(), key=lambda snapshot: snapshot.get('time', 0))
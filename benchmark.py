@@ -0,0 +1,277 @@
+"""Benchmarks of the translator on synthetic localization files.
+
+    python benchmark.py --sizes 1000,10000,100000 --depths 2,6 --output before.json
+    python benchmark.py --sizes 1000,10000,100000 --depths 2,6 --compare before.json
+
+Each corpus runs in its own process under Qt's offscreen platform, so peak
+memory is that of one corpus and no state carries over between them.
+Translate All runs against the mock backend with a fixed latency per request.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from localization import flatten_dict, unflatten_dict
+from translation_engine import TranslationEngine
+from translation_backends import make_translator_factory
+
+WORDS = ('player', 'session', 'host', 'join', 'world', 'mod', 'settings', 'password', 'server', 'invite',
+         'friend', 'boss', 'item', 'spirit', 'ash', 'summon', 'sign', 'grace', 'rune', 'arena', 'the', 'a',
+         'is', 'not', 'can', 'be', 'your', 'with', 'to', 'of', 'and', 'enabled', 'disabled', 'failed')
+DEFAULT_SIZES = '1000,10000,100000'
+DEFAULT_DEPTHS = '2,6'
+DEFAULT_LATENCY = 0.05
+# No request throttling by default, so Translate All measures the tool rather than the rate limit
+DEFAULT_RATE = 0
+TARGET_LANG = 'de'
+
+
+def make_sentence(rng, number):
+    words = rng.choices(WORDS, k=rng.randint(1, 12))
+    words[0] = words[0].capitalize()
+    text = ' '.join(words)
+    roll = rng.random()
+    if roll < 0.1:
+        text = f"<b>{text}</b> {number}"
+    elif roll < 0.2:
+        text = f"{text}\\n{' '.join(rng.choices(WORDS, k=4))}"
+    elif roll < 0.3:
+        text = f"{text} {{0}}"
+    return text
+
+
+def make_corpus(keys, depth, seed=0):
+    """Nested en.json and target dicts with keys entries spread over depth levels.
+
+    About 70% of the target is translated, 10% identical to the source and
+    20% missing.
+    """
+    rng = random.Random(seed)
+    fan_out = max(2, round(keys ** (1 / depth)))
+    flat_sources, flat_targets = {}, {}
+    for i in range(keys):
+        groups = [f"group{(i // fan_out ** level) % fan_out}" for level in range(depth - 1, 0, -1)]
+        key = '.'.join(groups + [f"key{i}"])
+        source = make_sentence(rng, i)
+        flat_sources[key] = source
+        roll = rng.random()
+        if roll < 0.7:
+            flat_targets[key] = f"[{TARGET_LANG}] {source}"
+        elif roll < 0.8:
+            flat_targets[key] = source
+    return unflatten_dict(flat_sources), unflatten_dict(flat_targets)
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class PhaseTimer:
+    """Times named phases; with trace_memory also the peak Python allocations of each"""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        if trace_memory:
+            tracemalloc.start()
+
+    def run(self, name, func, *args):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        result = func(*args)
+        phase = {'seconds': round(time.perf_counter() - start, 4)}
+        if self.trace_memory:
+            phase['python_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+        self.phases[name] = phase
+        return result
+
+
+def wait_for_translate_all(app, window):
+    while window.translation_thread.isRunning() or not window.translate_all_btn.isEnabled():
+        app.processEvents()
+        time.sleep(0.005)
+
+
+def run_case(keys, depth, latency, workers, rate=DEFAULT_RATE, trace_memory=False, gui=True):
+    """Benchmark one synthetic corpus in this process and return its results"""
+    timer = PhaseTimer(trace_memory)
+    nested_sources, nested_targets = make_corpus(keys, depth)
+    flat = timer.run('flatten_dict', flatten_dict, nested_sources)
+    timer.run('unflatten_dict', unflatten_dict, flat)
+    result = {'keys': keys, 'depth': depth, 'phases': timer.phases}
+    if not gui:
+        result['peak_rss_mb'] = peak_rss_mb()
+        return result
+
+    folder = tempfile.mkdtemp(prefix='translator-bench-')
+    try:
+        with open(os.path.join(folder, 'en.json'), 'w', encoding='utf-8') as f:
+            json.dump(nested_sources, f, ensure_ascii=False, indent=4)
+        target_path = os.path.join(folder, f'{TARGET_LANG}.json')
+        with open(target_path, 'w', encoding='utf-8') as f:
+            json.dump(nested_targets, f, ensure_ascii=False, indent=4)
+        here = os.path.dirname(os.path.abspath(__file__))
+        shutil.copy(os.path.join(here, 'dark_style.qss'), folder)
+        os.makedirs(os.path.join(folder, 'assets'))
+        shutil.copy(os.path.join(here, 'assets', 'supported_languages.json'), os.path.join(folder, 'assets'))
+        result['gui'] = run_gui(timer, folder, target_path, latency, workers, rate)
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_gui(timer, folder, target_path, latency, workers, rate):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import translator_app
+    from PyQt6.QtWidgets import QApplication, QFileDialog
+
+    # Point the app at the corpus and answer its file dialogs without showing them
+    translator_app.get_application_path = lambda: folder
+    saved_path = os.path.join(folder, f'{TARGET_LANG}_saved.json')
+    QFileDialog.getOpenFileName = staticmethod(lambda *args, **kwargs: (target_path, ''))
+    QFileDialog.getSaveFileName = staticmethod(lambda *args, **kwargs: (saved_path, ''))
+
+    app = QApplication.instance() or QApplication([])
+    window = timer.run('TranslatorApp()', translator_app.TranslatorApp)
+    # Before the event loop runs, which would start the same work on a background thread
+    timer.run('search_index.warm', window.model.search_index.warm)
+    window.show()
+    app.processEvents()
+    timer.run('load_translation_file', window.load_translation_file)
+    window.source_search.setText('player')
+    timer.run('apply_search_filters', window.apply_search_filters)
+    timer.run('show_missing_translations', window.show_missing_translations)
+    timer.run('save_translation', window.save_translation)
+
+    window.backend_combo.setCurrentText('mock')
+    window.hedge_combo.setCurrentIndex(0)
+    window.workers_spin.setValue(workers)
+    target_lang = window.lang_combo.currentText()
+    window.engines[(window.backend_spec(), window.hedge_spec(), target_lang)] = TranslationEngine(
+        make_translator_factory('mock', target_lang, latency=latency), workers=workers, rate=rate)
+
+    def translate_all():
+        window.translate_all()
+        wait_for_translate_all(app, window)
+
+    timer.run('translate_all', translate_all)
+    thread = window.translation_thread
+    stats = {'translated': len(thread.texts_to_translate), 'requests_saved': thread.requests_saved,
+             'status': window.status_label.text()}
+    window.close()
+    return stats
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline):
+    """Print each phase's time next to the baseline's, slowest changes first"""
+    old = {(case['keys'], case['depth']): case for case in baseline['cases'] if 'phases' in case}
+    rows = []
+    for case in results['cases']:
+        before = old.get((case['keys'], case['depth']))
+        if before is None or 'phases' not in case:
+            continue
+        for name, phase in case['phases'].items():
+            previous = before['phases'].get(name)
+            if previous and previous['seconds']:
+                rows.append((phase['seconds'] / previous['seconds'], case, name, previous['seconds'],
+                             phase['seconds']))
+    print(f"Compared with {baseline.get('commit') or 'baseline'}:")
+    for ratio, case, name, before, after in sorted(rows, key=lambda row: row[0], reverse=True):
+        print(f"  {case['keys']:>7} keys depth {case['depth']}  {name:<26} {before:8.3f}s -> {after:8.3f}s "
+              f"({ratio:.2f}x)")
+
+
+def format_case(case):
+    if 'error' in case:
+        return f"{case['keys']:>7} keys, depth {case['depth']}: failed: {case['error']}"
+    lines = [f"{case['keys']:>7} keys, depth {case['depth']} (peak RSS {case['peak_rss_mb']} MB)"]
+    for name, phase in case['phases'].items():
+        memory = f"  {phase['python_peak_mb']:8.1f} MB" if 'python_peak_mb' in phase else ""
+        lines.append(f"    {name:<26} {phase['seconds']:8.3f}s{memory}")
+    if 'gui' in case:
+        lines.append(f"    Translate All: {case['gui']['translated']} keys, {case['gui']['status']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the translator on synthetic localization files")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Comma separated key counts")
+    parser.add_argument('--depths', default=DEFAULT_DEPTHS, help="Comma separated nesting depths")
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY,
+                        help="Seconds the mock backend takes per request")
+    parser.add_argument('--workers', type=int, default=8, help="Parallel requests for Translate All")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help="Requests per second Translate All may start (0: no limit)")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Also record peak Python allocations per phase (slows every phase down)")
+    parser.add_argument('--no-gui', action='store_true', help="Only time the functions that need no Qt")
+    parser.add_argument('--output', metavar='FILE', help="Write the results as JSON to FILE")
+    parser.add_argument('--compare', metavar='FILE', help="Compare with results written by --output before")
+    parser.add_argument('--case', nargs=2, type=int, metavar=('KEYS', 'DEPTH'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        # Child process: benchmark one corpus and hand the results back on stdout
+        result = run_case(*args.case, args.latency, args.workers, args.rate, args.trace_memory, not args.no_gui)
+        print(json.dumps(result))
+        return 0
+
+    results = {'commit': git_commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+               'latency': args.latency, 'workers': args.workers, 'rate': args.rate, 'cases': []}
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get('QT_QPA_PLATFORM', 'offscreen'))
+    for keys in [int(size) for size in args.sizes.split(',')]:
+        for depth in [int(depth) for depth in args.depths.split(',')]:
+            command = [sys.executable, os.path.abspath(__file__), '--case', str(keys), str(depth),
+                       '--latency', str(args.latency), '--workers', str(args.workers), '--rate', str(args.rate)]
+            if args.trace_memory:
+                command.append('--trace-memory')
+            if args.no_gui:
+                command.append('--no-gui')
+            child = subprocess.run(command, capture_output=True, text=True, env=env)
+            try:
+                case = json.loads(child.stdout.strip().splitlines()[-1])
+            except (IndexError, ValueError):
+                case = {'keys': keys, 'depth': depth,
+                        'error': (child.stderr.strip().splitlines() or ['no output'])[-1]}
+            results['cases'].append(case)
+            print(format_case(case), flush=True)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(results, json.load(f))
+    return 1 if any('error' in case for case in results['cases']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
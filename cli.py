@@ -0,0 +1,277 @@
+"""Headless command line interface. Nothing here may import PyQt6."""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from localization import LOCALE_LANGUAGE_CODES, load_flat_json, write_flat_json
+from translation_engine import (TranslationEngine, group_segments, reuse_translations, DEFAULT_WORKERS, DEFAULT_RATE,
+                                DEFAULT_PACK_CHARS)
+from translation_backends import (make_translator_factory, parse_chain, backend_names, DEFAULT_BACKEND,
+                                  DEFAULT_HEDGE_PERCENTILE, GLOSSARY_FILE)
+from translation_memory import TranslationMemory, TRANSLATION_MEMORY_FILE
+from fuzzy_memory import FuzzyMemory
+from translation_stats import RunStats
+from validation import validate_files, language_files, ERRORS, WARNINGS
+from source_manifest import load_manifest, save_manifest, diff_sources, build_manifest
+
+COMMANDS = ('translate', 'validate')
+
+
+def translate_language(lang, source_path, out_dir, backend=DEFAULT_BACKEND, workers=DEFAULT_WORKERS,
+                       rate=DEFAULT_RATE, memory_path=None, pack_chars=DEFAULT_PACK_CHARS, hedge=None,
+                       hedge_percentile=DEFAULT_HEDGE_PERCENTILE):
+    """Fill in missing and source-changed keys of <out_dir>/<lang>.json and return a throughput report"""
+    start = time.perf_counter()
+    source = load_flat_json(source_path)
+    out_path = os.path.join(out_dir, f'{lang}.json')
+    existing = load_flat_json(out_path) if os.path.exists(out_path) else {}
+    manifest = load_manifest(out_path)
+    diff = diff_sources(source, existing, manifest)
+    missing = {key: str(source[key]) for key in diff.new + diff.source_changed}
+    target_lang = LOCALE_LANGUAGE_CODES.get(lang, lang)
+
+    translated = {}
+    reused = {'memory': 0, 'fuzzy': 0}
+    # Keys sharing a source text are translated once and fanned out
+    groups = group_segments(missing)
+    memory = TranslationMemory(memory_path) if memory_path else None
+    fuzzy = None
+    if missing:
+        fuzzy = FuzzyMemory((str(source[key]), str(value)) for key, value in existing.items()
+                            if key in source and key not in missing)
+        if memory is not None:
+            fuzzy.add_many(memory.pairs(target_lang, backend))
+    for keys, text, reused_from in reuse_translations(missing, groups, memory, target_lang, backend, fuzzy):
+        translated.update(dict.fromkeys(keys, text))
+        reused[reused_from] += len(keys)
+    duplicates = len(missing) - len(translated) - len(groups)
+
+    factory = make_translator_factory(backend, target_lang, hedge, hedge_percentile,
+                                      glossary_path=os.path.join(os.path.dirname(source_path), GLOSSARY_FILE))
+    engine = TranslationEngine(factory, workers=workers, rate=rate)
+    stats = RunStats(len(missing), target_lang, backend)
+    new_translations = {}
+    failed = 0
+    for keys, text, error in engine.translate_segments(missing, groups, pack_chars, stats=stats):
+        if error is None:
+            translated.update(dict.fromkeys(keys, text))
+            new_translations[missing[keys[0]]] = text
+        else:
+            failed += len(keys)
+            print(f"[{lang}] Error translating {', '.join(keys)}: {str(error)}", file=sys.stderr)
+    if memory is not None:
+        memory.put_many(new_translations, target_lang, backend)
+        memory.close()
+
+    # Keep en.json key order; keys that only exist in the target file go last
+    merged = {}
+    for key in source:
+        value = translated.get(key) or existing.get(key)
+        if value:
+            merged[key] = value
+    for key, value in existing.items():
+        merged.setdefault(key, value)
+
+    os.makedirs(out_dir, exist_ok=True)
+    write_flat_json(out_path, merged)
+    still_stale = {key for key in diff.source_changed if key not in translated}
+    save_manifest(out_path, build_manifest(source, merged, manifest, still_stale))
+
+    seconds = time.perf_counter() - start
+    chars = sum(len(missing[key]) for key in translated)
+    stats.finish()
+    summary = stats.summary()
+    return {
+        'lang': lang,
+        'path': out_path,
+        'total_keys': len(source),
+        'missing': len(missing),
+        'source_changed': len(diff.source_changed),
+        'removed': len(diff.removed),
+        'translated': len(translated),
+        'cached': reused['memory'],
+        'fuzzy': reused['fuzzy'],
+        'failed': failed,
+        'requests': engine.requests,
+        'duplicates': duplicates,
+        'pack_fallbacks': engine.pack_fallbacks,
+        'retries': summary['retries'],
+        'latency': summary['latency'],
+        'rate_limit_wait': summary['rate_limit_wait'],
+        'hedged': factory.tracker.hedged if hedge else 0,
+        'hedge_wins': factory.tracker.hedge_wins if hedge else 0,
+        'seconds': seconds,
+        'keys_per_second': len(translated) / seconds if seconds else 0.0,
+        'chars_per_second': chars / seconds if seconds else 0.0,
+    }
+
+
+def format_report(report):
+    return (f"{report['lang']:>6}: {report['translated']}/{report['missing']} missing or stale keys translated "
+            f"({report['cached']} cached, {report['fuzzy']} near-identical, {report['failed']} failed) in {report['seconds']:.1f}s, "
+            f"{report['requests']} requests ({report['duplicates']} duplicates skipped), "
+            f"{report['keys_per_second']:.1f} keys/s, {report['chars_per_second']:.0f} chars/s"
+            + (f", latency p50 {report['latency']['p50']:.2f}s p95 {report['latency']['p95']:.2f}s, "
+               f"{report['retries']} retries" if report['latency']['p50'] is not None else "")
+            + (f", {report['hedged']} hedged ({report['hedge_wins']} won)" if report.get('hedged') else ""))
+
+
+def run_translate(args):
+    langs = [lang.strip() for lang in args.langs.split(',') if lang.strip()]
+    if not langs:
+        print("No target languages given", file=sys.stderr)
+        return 2
+    try:
+        parse_chain(args.backend)
+        if args.hedge:
+            parse_chain(args.hedge)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    if not os.path.exists(args.input):
+        print(f"Source file not found: {args.input}", file=sys.stderr)
+        return 2
+
+    memory_path = None
+    if not args.no_memory:
+        memory_path = os.path.join(os.path.dirname(os.path.abspath(args.input)), TRANSLATION_MEMORY_FILE)
+
+    # Requests are network bound, so run at least a few languages at once even on small machines
+    processes = args.processes or min(len(langs), max(os.cpu_count() or 1, 4))
+    start = time.perf_counter()
+    reports = []
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {
+            executor.submit(translate_language, lang, args.input, args.out_dir, args.backend,
+                            args.workers, args.rate, memory_path, args.pack_chars, args.hedge,
+                            args.hedge_percentile): lang
+            for lang in langs
+        }
+        for future in as_completed(futures):
+            lang = futures[future]
+            try:
+                report = future.result()
+            except Exception as e:
+                print(f"{lang:>6}: failed: {str(e)}", file=sys.stderr)
+                reports.append({'lang': lang, 'error': str(e)})
+                continue
+            reports.append(report)
+            print(format_report(report))
+
+    total = sum(report.get('translated', 0) for report in reports)
+    seconds = time.perf_counter() - start
+    print(f"Translated {total} keys across {len(langs)} languages in {seconds:.1f}s")
+    failed = any('error' in report or report['failed'] for report in reports)
+    return 1 if failed else 0
+
+
+def format_validation(report):
+    if 'error' in report:
+        return f"{report['lang']:>6}: could not be read: {report['error']}"
+    counts = ', '.join(f"{len(report['issues'][name])} {name}" for name in ERRORS + WARNINGS
+                       if report['issues'][name])
+    status = 'FAIL' if report['errors'] else 'ok'
+    return f"{report['lang']:>6}: {status} ({counts or 'no issues'})"
+
+
+def run_validate(args):
+    folder = args.dir
+    source_path = args.input or os.path.join(folder, 'en.json')
+    if not os.path.exists(source_path):
+        print(f"Source file not found: {source_path}", file=sys.stderr)
+        return 2
+    paths = language_files(folder, os.path.basename(source_path))
+    if args.langs:
+        langs = {lang.strip() for lang in args.langs.split(',')}
+        paths = [path for path in paths if os.path.splitext(os.path.basename(path))[0] in langs]
+    if not paths:
+        print(f"No language files in {folder}", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    processes = args.processes or min(len(paths), os.cpu_count() or 1)
+    try:
+        if processes > 1:
+            # One share of the files per process, so each parses en.json once
+            shares = [paths[i::processes] for i in range(processes)]
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                results = list(executor.map(validate_files, [source_path] * processes, shares))
+            reports = sorted((report for share in results for report in share),
+                             key=lambda report: report['path'])
+        else:
+            reports = validate_files(source_path, paths)
+    except Exception as e:
+        print(f"Could not read {source_path}: {str(e)}", file=sys.stderr)
+        return 2
+    seconds = time.perf_counter() - start
+
+    errors = sum(report['errors'] for report in reports)
+    warnings = sum(report['warnings'] for report in reports)
+    failed = bool(errors or (args.strict and warnings))
+    summary = {'source': source_path, 'files': reports, 'errors': errors, 'warnings': warnings,
+               'passed': not failed, 'seconds': seconds}
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    if args.format == 'json':
+        json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for report in reports:
+            print(format_validation(report))
+        print(f"Checked {len(reports)} files in {seconds:.1f}s: {errors} errors, {warnings} warnings")
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description="Seamless Co-op Mod Manager Translator")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    translate = subparsers.add_parser('translate', help="Fill in missing or stale keys of target language files")
+    translate.add_argument('--langs', required=True,
+                           help="Comma separated locale codes, e.g. de,fr,ja,zh_CN")
+    translate.add_argument('--in', dest='input', default='en.json', help="Source file (default: en.json)")
+    translate.add_argument('--out-dir', default='.', help="Folder holding <lang>.json files")
+    translate.add_argument('--backend', default=DEFAULT_BACKEND,
+                           help=f"Backend or comma separated fallback chain, e.g. glossary,google "
+                                f"(available: {', '.join(backend_names())})")
+    translate.add_argument('--hedge', metavar='BACKEND',
+                           help="Race this backend against requests slower than --hedge-percentile")
+    translate.add_argument('--hedge-percentile', type=float, default=DEFAULT_HEDGE_PERCENTILE,
+                           help="Latency percentile of recent requests after which a hedge is sent")
+    translate.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                           help="Concurrent requests per language")
+    translate.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                           help="Maximum requests per second per language")
+    translate.add_argument('--processes', type=int, default=0,
+                           help="Languages translated in parallel (default: up to max(CPU count, 4))")
+    translate.add_argument('--pack-chars', type=int, default=DEFAULT_PACK_CHARS,
+                           help="Join short texts into requests of up to this many characters (0: one key per request)")
+    translate.add_argument('--no-memory', action='store_true', help="Do not use the translation memory cache")
+    translate.set_defaults(func=run_translate)
+
+    validate = subparsers.add_parser('validate', help="Check every language file of a folder against en.json")
+    validate.add_argument('--dir', default='.', help="Localization folder (default: current folder)")
+    validate.add_argument('--in', dest='input', help="Source file (default: <dir>/en.json)")
+    validate.add_argument('--langs', help="Only check these comma separated locale codes")
+    validate.add_argument('--format', choices=('text', 'json'), default='text',
+                          help="Print a summary per file or the full JSON report")
+    validate.add_argument('--report', metavar='FILE', help="Also write the full JSON report to FILE")
+    validate.add_argument('--strict', action='store_true',
+                          help="Fail on warnings (extra, identical or source-changed keys) too")
+    validate.add_argument('--processes', type=int, default=0,
+                          help="Files checked in parallel (default: one per CPU core)")
+    validate.set_defaults(func=run_validate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
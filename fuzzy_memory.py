@@ -0,0 +1,155 @@
+import heapq
+import itertools
+import re
+import threading
+from collections import Counter, namedtuple
+from difflib import SequenceMatcher
+
+from search_index import ngrams
+
+# Suggestions scoring below this are not worth showing
+DEFAULT_THRESHOLD = 0.6
+# Candidates rescored exactly after the n-gram overlap pre-filter
+CANDIDATES = 20
+
+_NON_WORD = re.compile(r'[\W_]+')
+_NUMBER = re.compile(r'\d+')
+
+Suggestion = namedtuple('Suggestion', ['score', 'source', 'target', 'near_exact'])
+
+
+def normalize(text):
+    return ' '.join(str(text).casefold().split())
+
+
+def skeleton(text):
+    """Text reduced to letters, with every number as 0; equal skeletons are near-exact matches"""
+    return _NUMBER.sub('0', _NON_WORD.sub('', str(text).casefold()))
+
+
+def adapt_numbers(source, target, text):
+    """Carry the numbers of text into target, the translation of source; None if that is ambiguous"""
+    old = _NUMBER.findall(source)
+    new = _NUMBER.findall(text)
+    if old == new:
+        return target
+    if len(old) != len(new) or _NUMBER.findall(target) != old:
+        return None
+    replacements = iter(new)
+    return _NUMBER.sub(lambda match: next(replacements), target)
+
+
+class FuzzyMemory:
+    """Similarity index over translated (source, target) pairs of one language.
+
+    Candidates are the entries sharing the most trigrams with the query,
+    looked up in an inverted index; the best are rescored with difflib.
+    Entries whose sources only differ in case, punctuation, spacing or
+    numbers are found through their skeleton and count as near-exact.
+    """
+
+    def __init__(self, pairs=None):
+        self.sources = []
+        self.targets = []
+        self.sizes = []
+        self.postings = {}
+        self.entries = {}
+        self.skeletons = {}
+        self.lock = threading.Lock()
+        # Set once load() has indexed the initial pairs
+        self.ready = threading.Event()
+        if pairs is not None:
+            self.load(pairs)
+
+    def __len__(self):
+        return len(self.sources)
+
+    def load(self, pairs):
+        """Index the initial pairs, e.g. on a background thread, then mark the memory ready"""
+        try:
+            self.add_many(pairs)
+        finally:
+            self.ready.set()
+
+    def add_many(self, pairs, chunk_size=1000):
+        """Index pairs a chunk at a time, so suggest() can run while a large memory is loaded"""
+        pairs = iter(pairs)
+        while True:
+            chunk = list(itertools.islice(pairs, chunk_size))
+            if not chunk:
+                return
+            with self.lock:
+                for source, target in chunk:
+                    self._add(source, target)
+
+    def add(self, source, target):
+        with self.lock:
+            self._add(source, target)
+
+    def _add(self, source, target):
+        if not source or not target or source == target:
+            return
+        text = normalize(source)
+        entry = self.entries.get(text)
+        if entry is not None:
+            self.targets[entry] = target
+            return
+        entry = len(self.sources)
+        self.entries[text] = entry
+        self.skeletons.setdefault(skeleton(source), entry)
+        self.sources.append(source)
+        self.targets.append(target)
+        grams = ngrams(f' {text} ')
+        self.sizes.append(len(grams))
+        for gram in grams:
+            posting = self.postings.get(gram)
+            if posting is None:
+                self.postings[gram] = [entry]
+            else:
+                posting.append(entry)
+
+    def near_exact(self, text):
+        """Return a Suggestion that can be used without review, or None"""
+        with self.lock:
+            entry = self.entries.get(normalize(text))
+            if entry is None:
+                entry = self.skeletons.get(skeleton(text))
+            if entry is None:
+                return None
+            source, target = self.sources[entry], self.targets[entry]
+        adapted = adapt_numbers(source, target, text)
+        if adapted is None:
+            return None
+        score = 1.0 if normalize(source) == normalize(text) else SequenceMatcher(
+            None, _NUMBER.sub('0', normalize(source)), _NUMBER.sub('0', normalize(text))).ratio()
+        return Suggestion(score, source, adapted, True)
+
+    def suggest(self, text, limit=3, threshold=DEFAULT_THRESHOLD):
+        """Best matching earlier translations of text, highest score first"""
+        query = normalize(text)
+        grams = ngrams(f' {query} ')
+        if not grams:
+            return []
+        with self.lock:
+            # A source sharing at least half the query's trigrams must share one of its rarer
+            # half, so the long posting lists of common trigrams never need to be read
+            postings = sorted((self.postings.get(gram, ()) for gram in grams), key=len)
+            counts = Counter()
+            for posting in postings[:len(postings) // 2 + 1]:
+                counts.update(posting)
+            # Most shared trigrams first, then overlap relative to both sizes (Dice)
+            top = counts.most_common(CANDIDATES * 4)
+            ranked = heapq.nlargest(CANDIDATES, top, key=lambda item: item[1] / (len(grams) + self.sizes[item[0]]))
+            candidates = [(self.sources[entry], self.targets[entry]) for entry, _ in ranked]
+        suggestions = []
+        exact = self.near_exact(text)
+        if exact is not None:
+            suggestions.append(exact)
+        for source, target in candidates:
+            if exact is not None and source == exact.source:
+                continue
+            score = SequenceMatcher(None, normalize(source), query).ratio()
+            if score >= threshold:
+                suggestions.append(Suggestion(score, source, target, False))
+        suggestions.sort(key=lambda suggestion: suggestion.score, reverse=True)
+        return suggestions[:limit]
@@ -0,0 +1,346 @@
+import contextlib
+import json
+import os
+import re
+import shutil
+import tempfile
+
+SUPPORTED_LANGUAGES_FILE = 'supported_languages.json'
+# Cached next to en.json; not .json, so it is never taken for a language file
+SUPPORTED_LANGUAGES_CACHE = 'supported_languages.cache'
+KEY_ESCAPE = '\\'
+# Files at least this large are parsed incrementally instead of with json.load
+STREAMING_THRESHOLD = 64 * 1024 * 1024
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+_SCALAR_END = re.compile(r'[,}\] \t\r\n]')
+_encode_string = json.encoder.encode_basestring
+
+# Locale file names used by Seamless Co-op mapped to Google Translate language codes
+LOCALE_LANGUAGE_CODES = {
+    'ar': 'ar',
+    'de': 'de',
+    'en': 'en',
+    'es_es': 'es',
+    'es_li': 'es',
+    'fr': 'fr',
+    'it': 'it',
+    'ja': 'ja',
+    'ko': 'ko',
+    'pl': 'pl',
+    'porbr': 'pt',
+    'ru': 'ru',
+    'th': 'th',
+    'zh_CN': 'zh-CN',
+    'zh_TW': 'zh-TW',
+}
+
+
+def language_code(lang):
+    """Google Translate code of a locale file name ('porbr'), language name ('portuguese') or code ('pt').
+
+    The GUI names languages and the command line uses locale file names, so
+    anything keyed by language (translation memory, glossary) goes through this.
+    """
+    if lang in LOCALE_LANGUAGE_CODES:
+        return LOCALE_LANGUAGE_CODES[lang]
+    try:
+        from deep_translator.constants import GOOGLE_LANGUAGES_TO_CODES
+    except ImportError:
+        return lang
+    return GOOGLE_LANGUAGES_TO_CODES.get(lang.lower(), lang)
+
+
+def clean_html(text, preserve_html=False):
+    if preserve_html:
+        # Only convert newlines and backslashes while preserving HTML
+        text = text.replace('\\n', '\n')
+        return text
+    else:
+        # Remove HTML tags and convert HTML entities for display
+        text = re.sub(r'<[^>]+>', '', text)  # Remove HTML tags
+        text = text.replace('&quot;', '"')    # Convert quotes
+        text = text.replace('\\n', '\n')      # Convert newlines
+        text = text.replace('\\', '')         # Remove remaining backslashes
+        return text
+
+
+def escape_key(segment, sep='.'):
+    """Escape the separator (and the escape character) inside a single key segment"""
+    if KEY_ESCAPE in segment or sep in segment:
+        return segment.replace(KEY_ESCAPE, KEY_ESCAPE * 2).replace(sep, KEY_ESCAPE + sep)
+    return segment
+
+
+def split_key(key, sep='.'):
+    """Split a flattened key into its segments, honouring escaped separators"""
+    if KEY_ESCAPE not in key:
+        return key.split(sep)
+    parts = []
+    current = []
+    escaped = False
+    for char in key:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == KEY_ESCAPE:
+            escaped = True
+        elif char == sep:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+    return parts
+
+
+def unescape_key(key, sep='.'):
+    """A flattened key as shown to the user: segments joined by sep, without escapes"""
+    if KEY_ESCAPE not in key:
+        return key
+    return sep.join(split_key(key, sep))
+
+
+def flatten_dict(d, parent_key='', sep='.'):
+    """Flatten nested dicts into {'a.b.c': value}, keeping the original key order.
+
+    Separators inside keys are escaped so unflatten_dict can restore them.
+    """
+    result = {}
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            k = escape_key(str(k), sep)
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((new_key, iter(v.items())))
+                break
+            result[new_key] = v
+        else:
+            stack.pop()
+    return result
+
+
+def _child(d, parts):
+    for part in parts:
+        child = d.get(part)
+        if child is None:
+            child = d[part] = {}
+        d = child
+    return d
+
+
+def unflatten_dict(dictionary, sep='.'):
+    resultDict = dict()
+    # Flattened keys arrive grouped by parent, so reuse the last parent container
+    last_parent = ''
+    container = resultDict
+    for key, value in dictionary.items():
+        if KEY_ESCAPE in key:
+            parts = split_key(key, sep)
+            _child(resultDict, parts[:-1])[parts[-1]] = value
+            last_parent, container = '', resultDict
+            continue
+        parent, _, leaf = key.rpartition(sep)
+        if parent != last_parent:
+            container = _child(resultDict, parent.split(sep)) if parent else resultDict
+            last_parent = parent
+        container[leaf] = value
+    return resultDict
+
+
+class _StreamReader:
+    """Minimal pull tokenizer over a JSON text file read in chunks"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ''
+
+    def take(self, expected):
+        char = self.peek()
+        if not char or char not in expected:
+            raise ValueError(f"Expected one of {expected!r} but found {char!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        if self.peek() not in '"[{':
+            # A number or literal cut at the chunk boundary may continue in the next chunk
+            while _SCALAR_END.search(self.buf, self.pos) is None and self.fill():
+                pass
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            self.pos = end
+            return value
+
+
+def iter_flat_json(path, sep='.', chunk_size=1 << 16):
+    """Yield (flat_key, value) pairs from a nested JSON object file without loading it whole"""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _StreamReader(f, chunk_size)
+        reader.take('{')
+        prefixes = ['']
+        opened = True
+        while prefixes:
+            if opened and reader.peek() == '}':
+                reader.pos += 1
+                prefixes.pop()
+                opened = False
+                continue
+            if not opened and reader.take(',}') == '}':
+                prefixes.pop()
+                continue
+            opened = False
+            if reader.peek() != '"':
+                raise ValueError(f"Expected a key in {path}")
+            key = escape_key(reader.value(), sep)
+            reader.take(':')
+            prefix = prefixes[-1]
+            flat_key = f"{prefix}{sep}{key}" if prefix else key
+            if reader.peek() == '{':
+                reader.pos += 1
+                prefixes.append(flat_key)
+                opened = True
+            else:
+                yield flat_key, reader.value()
+        if reader.peek():
+            raise ValueError(f"Extra data after the top-level object in {path}")
+
+
+def load_flat_json(path, sep='.'):
+    """Load a localization file as a flat mapping, streaming it if it is large"""
+    if os.path.getsize(path) < STREAMING_THRESHOLD:
+        with open(path, 'r', encoding='utf-8') as f:
+            return flatten_dict(json.load(f), sep=sep)
+    return dict(iter_flat_json(path, sep))
+
+
+@contextlib.contextmanager
+def atomic_write(path, encoding='utf-8'):
+    """Open a temporary file next to path that replaces it only once fully written"""
+    path = os.path.abspath(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f'.{os.path.basename(path)}.', suffix='.tmp',
+                                    dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'w', encoding=encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(path):
+            shutil.copymode(path, tmp_path)
+        else:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _UngroupedKeys(Exception):
+    pass
+
+
+def _write_nested(f, items, sep, indent):
+    """Stream grouped flat items as the same text json.dump(..., indent=indent) would produce"""
+    open_path = []
+    has_items = [False]
+    closed = set()
+    pads = ['\n' + ' ' * (indent * depth) for depth in range(16)]
+    f.write('{')
+    for key, value in items:
+        parts = split_key(key, sep)
+        leaf = parts.pop()
+        if len(parts) + 2 > len(pads):
+            pads.extend('\n' + ' ' * (indent * depth) for depth in range(len(pads), len(parts) + 2))
+        if parts != open_path:
+            common = 0
+            while common < len(open_path) and common < len(parts) and open_path[common] == parts[common]:
+                common += 1
+            chunks = []
+            while len(open_path) > common:
+                closed.add(tuple(open_path))
+                open_path.pop()
+                has_items.pop()
+                chunks.append(pads[len(open_path) + 1] + '}')
+            for part in parts[common:]:
+                open_path.append(part)
+                if tuple(open_path) in closed:
+                    raise _UngroupedKeys(key)
+                chunks.append((',' if has_items[-1] else '') + pads[len(open_path)] + _encode_string(part) + ': {')
+                has_items[-1] = True
+                has_items.append(False)
+            f.write(''.join(chunks))
+        pad = pads[len(open_path) + 1]
+        if isinstance(value, str):
+            text = _encode_string(value)
+        else:
+            text = json.dumps(value, ensure_ascii=False, indent=indent).replace('\n', pad)
+        f.write((',' if has_items[-1] else '') + pad + _encode_string(leaf) + ': ' + text)
+        has_items[-1] = True
+    while open_path:
+        open_path.pop()
+        f.write(pads[len(open_path) + 1] + '}')
+    f.write('\n}' if has_items[0] else '}')
+
+
+def write_flat_json(path, flat, sep='.', indent=4):
+    """Atomically write a flat {'a.b': value} mapping as nested JSON.
+
+    Keys grouped by parent (as flatten_dict and iter_flat_json produce them)
+    are streamed straight to disk; anything else goes through unflatten_dict.
+    """
+    with atomic_write(path) as f:
+        try:
+            _write_nested(f, flat.items(), sep, indent)
+        except _UngroupedKeys:
+            f.seek(0)
+            f.truncate()
+            json.dump(unflatten_dict(flat, sep), f, ensure_ascii=False, indent=indent)
+
+
+def load_supported_languages(*paths):
+    """Return the language list from the first readable snapshot among paths"""
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                languages = json.load(f)
+            if languages:
+                return languages
+        except (OSError, ValueError):
+            continue
+    return []
+
+
+def save_supported_languages(path, languages):
+    with atomic_write(path) as f:
+        json.dump(languages, f, ensure_ascii=False, indent=4)
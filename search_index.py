@@ -0,0 +1,132 @@
+import threading
+from collections import defaultdict
+
+from localization import clean_html
+
+NGRAM_SIZE = 3  # ngrams() below is specialised for trigrams
+# Once this many rows were edited since the last build, rebuild instead of patching
+REBUILD_THRESHOLD = 2000
+
+KEY_FIELD, SOURCE_FIELD, TARGET_FIELD = 'key', 'source', 'target'
+
+
+def ngrams(text):
+    return set(zip(text, text[1:], text[2:]))
+
+
+class FieldIndex:
+    """Case-folded copies of one column plus an inverted n-gram index over them"""
+
+    def __init__(self, raw_texts, normalize):
+        self.raw_texts = raw_texts
+        self.normalize = normalize
+        self.texts = None
+        self.postings = None
+        self.dirty = set()
+        # (query, result) of the last search, reused when the query is extended
+        self.last = None
+        # Building may happen on a background thread while the GUI searches
+        self.lock = threading.Lock()
+
+    def ensure_texts(self):
+        if self.texts is None:
+            self.texts = [self.normalize(text) for text in self.raw_texts]
+        return self.texts
+
+    def build(self):
+        postings = defaultdict(list)
+        for entry, text in enumerate(self.ensure_texts()):
+            for gram in ngrams(text):
+                postings[gram].append(entry)
+        self.postings = postings
+        self.dirty.clear()
+
+    def warm(self):
+        with self.lock:
+            if self.postings is None:
+                self.build()
+
+    def update(self, entry, text):
+        with self.lock:
+            self.raw_texts[entry] = text
+            if self.texts is not None:
+                self.texts[entry] = self.normalize(text)
+                if self.postings is not None:
+                    self.dirty.add(entry)
+            self.last = None
+
+    def reset(self, raw_texts):
+        with self.lock:
+            self.raw_texts = raw_texts
+            self.texts = None
+            self.postings = None
+            self.dirty.clear()
+            self.last = None
+
+    def candidates(self, query):
+        """Entries that may contain query: rows sharing its two rarest n-grams plus edited rows"""
+        if self.postings is None or len(self.dirty) > REBUILD_THRESHOLD:
+            self.build()
+        lists = sorted((self.postings.get(gram, ()) for gram in ngrams(query)), key=len)
+        rarest = lists[0]
+        if len(lists) > 1 and rarest:
+            second = set(lists[1])
+            rarest = [entry for entry in rarest if entry in second]
+        if not self.dirty:
+            return rarest
+        return sorted(set(rarest) | self.dirty)
+
+    def search(self, query):
+        with self.lock:
+            return self._search(query)
+
+    def _search(self, query):
+        texts = self.ensure_texts()
+        if self.last is not None and self.last[0] in query:
+            # Extending the previous query can only narrow its result
+            candidates = self.last[1]
+        elif len(query) >= NGRAM_SIZE:
+            candidates = self.candidates(query)
+        else:
+            candidates = range(len(texts))
+        result = [entry for entry in candidates if query in texts[entry]]
+        self.last = (query, result)
+        return result
+
+
+class SearchIndex:
+    """Substring search over the key, source and target columns of a translation table"""
+
+    def __init__(self, keys, sources, targets):
+        self.size = len(keys)
+        self.fields = {
+            KEY_FIELD: FieldIndex(keys, str.casefold),
+            SOURCE_FIELD: FieldIndex(sources, lambda text: clean_html(text).casefold()),
+            TARGET_FIELD: FieldIndex(list(targets), str.casefold),
+        }
+
+    def warm(self):
+        """Normalize and index the key and source columns ahead of the first search"""
+        self.fields[KEY_FIELD].warm()
+        self.fields[SOURCE_FIELD].warm()
+
+    def update_target(self, entry, text):
+        self.fields[TARGET_FIELD].update(entry, text)
+
+    def reset_targets(self, targets):
+        self.fields[TARGET_FIELD].reset(list(targets))
+
+    def search(self, key_text="", source_text="", target_text=""):
+        """Return the sorted entries matching every non-empty query"""
+        result = None
+        for field, query in ((KEY_FIELD, key_text), (SOURCE_FIELD, source_text), (TARGET_FIELD, target_text)):
+            query = query.casefold()
+            if not query:
+                continue
+            matches = self.fields[field].search(query)
+            if result is None:
+                result = matches
+            else:
+                keep = set(matches)
+                result = [entry for entry in result if entry in keep]
+        return list(range(self.size)) if result is None else result
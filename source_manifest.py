@@ -0,0 +1,79 @@
+import hashlib
+import json
+from collections import namedtuple
+
+from localization import atomic_write
+
+# Stored next to the target file, e.g. de.json.manifest; not *.json so the
+# mod manager never mistakes it for a language file
+MANIFEST_SUFFIX = '.manifest'
+MANIFEST_VERSION = 1
+
+SourceDiff = namedtuple('SourceDiff', ['new', 'removed', 'source_changed', 'unchanged'])
+
+
+def source_fingerprint(text):
+    """Short hash of the exact en.json text a translation was made from"""
+    return hashlib.blake2b(str(text).encode('utf-8'), digest_size=8).hexdigest()
+
+
+def manifest_path(target_path):
+    return target_path + MANIFEST_SUFFIX
+
+
+def load_manifest(target_path):
+    """Return {key: source fingerprint} for target_path, or None if it has no manifest"""
+    try:
+        with open(manifest_path(target_path), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != MANIFEST_VERSION:
+        return None
+    return data.get('sources', {})
+
+
+def save_manifest(target_path, fingerprints):
+    with atomic_write(manifest_path(target_path)) as f:
+        json.dump({'version': MANIFEST_VERSION, 'sources': fingerprints}, f, indent=1)
+
+
+def diff_sources(sources, translations, manifest):
+    """Classify keys of a target file against the current en.json.
+
+    new: no translation yet. source_changed: translated, but en.json changed
+    since (only detectable with a manifest). unchanged: translated and current.
+    removed: present in the target or manifest but gone from en.json.
+    """
+    new, changed, unchanged = [], [], []
+    manifest = manifest or {}
+    for key, text in sources.items():
+        if not translations.get(key):
+            new.append(key)
+            continue
+        recorded = manifest.get(key)
+        if recorded is not None and recorded != source_fingerprint(text):
+            changed.append(key)
+        else:
+            unchanged.append(key)
+    removed = [key for key in translations if key not in sources]
+    removed.extend(key for key in manifest if key not in sources and key not in translations)
+    return SourceDiff(new, removed, changed, unchanged)
+
+
+def build_manifest(sources, translations, previous=None, stale_keys=()):
+    """Fingerprints to save alongside translations.
+
+    Keys still in stale_keys keep their previous fingerprint so they stay
+    marked as source-changed until someone re-translates them.
+    """
+    previous = previous or {}
+    fingerprints = {}
+    for key, text in translations.items():
+        if not text or key not in sources:
+            continue
+        if key in stale_keys and key in previous:
+            fingerprints[key] = previous[key]
+        else:
+            fingerprints[key] = source_fingerprint(sources[key])
+    return fingerprints
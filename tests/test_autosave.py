@@ -0,0 +1,49 @@
+import os
+
+from autosave import Autosaver, load_snapshots, snapshot_prefix
+
+
+def test_snapshots_rotate_through_slots(tmp_path):
+    folder = str(tmp_path / 'autosave')
+    autosaver = Autosaver(folder, keep=2)
+    for n in range(3):
+        autosaver.submit('de.json', '/mods/de.json', {'start': f"Spiel starten {n}"})
+        autosaver.flush()
+    prefix = snapshot_prefix('de.json', '/mods/de.json')
+    assert sorted(os.listdir(folder)) == [f'{prefix}0.json', f'{prefix}1.json']
+    snapshots = load_snapshots(folder)
+    assert len(snapshots) == 1
+    assert snapshots[0]['sequence'] == 2
+    assert snapshots[0]['edits'] == {'start': "Spiel starten 2"}
+
+
+def test_sequence_continues_after_restart(tmp_path):
+    folder = str(tmp_path / 'autosave')
+    autosaver = Autosaver(folder)
+    autosaver.submit('de.json', None, {'start': "Spiel starten"})
+    autosaver.flush()
+    # A new session picks up after the newest snapshot rather than overwriting it
+    autosaver = Autosaver(folder)
+    autosaver.submit('de.json', None, {'start': "Spiel beginnen"})
+    autosaver.flush()
+    assert [snapshot['edits'] for snapshot in load_snapshots(folder)] == [{'start': "Spiel beginnen"}]
+    assert len(os.listdir(folder)) == 2
+
+
+def test_discard_removes_only_that_column(tmp_path):
+    folder = str(tmp_path / 'autosave')
+    autosaver = Autosaver(folder)
+    autosaver.submit('de.json', '/mods/de.json', {'start': "Spiel starten"})
+    autosaver.flush()
+    autosaver.submit('fr.json', '/mods/fr.json', {'start': "Jouer"})
+    autosaver.flush()
+    autosaver.discard('de.json', '/mods/de.json')
+    assert [snapshot['name'] for snapshot in load_snapshots(folder)] == ['fr.json']
+
+
+def test_load_snapshots_skips_unreadable_files(tmp_path):
+    folder = tmp_path / 'autosave'
+    assert load_snapshots(str(folder)) == []
+    folder.mkdir()
+    (folder / 'de-00000000.0.json').write_text('{"name": "de', encoding='utf-8')
+    assert load_snapshots(str(folder)) == []
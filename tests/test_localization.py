@@ -0,0 +1,79 @@
+import json
+
+import pytest
+
+from localization import (flatten_dict, unflatten_dict, iter_flat_json, load_flat_json, write_flat_json,
+                          split_key, escape_key, unescape_key)
+
+NESTED = {
+    'menu': {
+        'title': "Seamless <b>Co-op</b>",
+        'x.y': "Dotted key",
+        'back\\slash': "Backslash key",
+        'deep': {'er': {'still': "Line one\\nLine two", 'count': 3, 'flag': True, 'none': None}},
+        'empty': {},
+    },
+    'list': [1, {'a': "b"}],
+    'unicode': "Überschrift – 日本語",
+    'last': "",
+}
+
+
+def write_json(path, data, **kwargs):
+    path.write_text(json.dumps(data, ensure_ascii=False, **kwargs), encoding='utf-8')
+    return str(path)
+
+
+def test_escaped_keys_round_trip():
+    for segment in ('plain', 'x.y', 'a\\b', 'trailing\\', '.', '\\.'):
+        assert split_key(f"{escape_key(segment)}.leaf") == [segment, 'leaf']
+    assert unescape_key('menu.x\\.y') == 'menu.x.y'
+    flat = flatten_dict(NESTED)
+    assert 'menu.x\\.y' in flat
+    # Empty objects have no leaves to keep them
+    expected = json.loads(json.dumps(NESTED))
+    del expected['menu']['empty']
+    assert unflatten_dict(flat) == expected
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1 << 16])
+@pytest.mark.parametrize('indent', [None, 4])
+def test_iter_flat_json_matches_flatten_dict(tmp_path, chunk_size, indent):
+    path = write_json(tmp_path / 'fr.json', NESTED, indent=indent)
+    assert list(iter_flat_json(path, chunk_size=chunk_size)) == list(flatten_dict(NESTED).items())
+
+
+@pytest.mark.parametrize('text', ['', '[]', '{"a": 1', '{"a" 1}', '{"a": 1} {}', '{"a": 1,}'])
+def test_iter_flat_json_rejects_malformed_files(tmp_path, text):
+    path = tmp_path / 'bad.json'
+    path.write_text(text, encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_flat_json(str(path), chunk_size=2))
+
+
+def test_write_flat_json_matches_json_dump(tmp_path):
+    flat = flatten_dict(NESTED)
+    path = str(tmp_path / 'out.json')
+    write_flat_json(path, flat)
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    # Grouped keys are streamed; the result must be what json.dump would have written
+    assert text == json.dumps(unflatten_dict(flat), ensure_ascii=False, indent=4)
+    assert load_flat_json(path) == flat
+    assert list(iter_flat_json(path, chunk_size=5)) == list(flat.items())
+
+
+def test_write_flat_json_with_ungrouped_keys(tmp_path):
+    flat = {'a.b': "1", 'c': "2", 'a.d': "3", 'x\\.y.z': "4"}
+    path = str(tmp_path / 'out.json')
+    write_flat_json(path, flat)
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == {'a': {'b': "1", 'd': "3"}, 'c': "2", 'x.y': {'z': "4"}}
+    assert load_flat_json(path) == {'a.b': "1", 'a.d': "3", 'c': "2", 'x\\.y.z': "4"}
+
+
+def test_write_flat_json_empty(tmp_path):
+    path = str(tmp_path / 'out.json')
+    write_flat_json(path, {})
+    assert load_flat_json(path) == {}
+    assert list(iter_flat_json(path)) == []
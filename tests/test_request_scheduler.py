@@ -0,0 +1,79 @@
+import threading
+
+from translation_engine import TranslationEngine, RequestScheduler, BatchControl, PRIORITY_INTERACTIVE, PRIORITY_BATCH
+
+
+class Recorder:
+    """Translator that logs what it was asked; 'block' waits for the gate to open"""
+
+    def __init__(self, log, gate=None):
+        self.log = log
+        self.gate = gate
+        self.blocked = threading.Event()
+
+    def translate(self, text):
+        if self.gate is not None and text == 'block':
+            self.blocked.set()
+            self.gate.wait(5)
+        self.log.append(text)
+        return text.upper()
+
+
+def test_scheduler_serves_interactive_requests_first():
+    log, gate = [], threading.Event()
+    recorder = Recorder(log, gate)
+    engine = TranslationEngine(lambda: recorder, workers=1, rate=0)
+    scheduler = RequestScheduler(workers=1)
+    done = threading.Semaphore(0)
+    try:
+        texts = {'block': 'block', 'b1': 'b1', 'b2': 'b2', 'now': 'now'}
+        scheduler.submit(engine, ['block'], texts, lambda _: done.release())
+        # Keep the only worker busy while the others queue up
+        assert recorder.blocked.wait(5)
+        for key in ('b1', 'b2'):
+            scheduler.submit(engine, [key], texts, lambda _: done.release(), PRIORITY_BATCH)
+        scheduler.submit(engine, ['now'], texts, lambda _: done.release(), PRIORITY_INTERACTIVE)
+        gate.set()
+        for _ in range(4):
+            assert done.acquire(timeout=5)
+    finally:
+        scheduler.shutdown()
+    assert log == ['block', 'now', 'b1', 'b2']
+
+
+def test_scheduler_map_and_cancel():
+    log, gate = [], threading.Event()
+    engine = TranslationEngine(lambda: Recorder(log, gate), workers=1, rate=0)
+    scheduler = RequestScheduler(workers=1)
+    try:
+        texts = {'block': 'block', **{f"k{i}": f"k{i}" for i in range(20)}}
+        gate.set()
+        assert sorted(key for key, _, _ in scheduler.map(engine, [[key] for key in texts], texts)) == sorted(texts)
+
+        log.clear()
+        gate.clear()
+        control = BatchControl()
+        results = scheduler.map(engine, [[key] for key in texts], texts, control=control)
+        threading.Timer(0.05, lambda: (control.cancel(), gate.set())).start()
+        # Only the request that was already running when the batch was cancelled got through
+        assert [key for key, _, _ in results] in ([], ['block'])
+        assert log == ['block']
+        assert scheduler.pending() == 0
+    finally:
+        scheduler.shutdown()
+
+
+def test_paused_batch_resumes():
+    log = []
+    engine = TranslationEngine(lambda: Recorder(log), workers=2, rate=0)
+    scheduler = RequestScheduler(workers=2)
+    try:
+        texts = {f"k{i}": f"k{i}" for i in range(10)}
+        control = BatchControl()
+        control.pause()
+        results = scheduler.map(engine, [[key] for key in texts], texts, control=control)
+        threading.Timer(0.1, lambda: (log.append('resumed'), control.resume())).start()
+        assert sorted(key for key, _, _ in results) == sorted(texts)
+        assert log[0] == 'resumed'
+    finally:
+        scheduler.shutdown()
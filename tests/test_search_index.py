@@ -0,0 +1,62 @@
+import random
+
+from localization import clean_html
+from search_index import SearchIndex
+
+WORDS = ('Player', 'session', 'HOST', 'join', 'world', '<b>mod</b>', 'settings', 'pass', 'password', 'Über', 'ab')
+
+
+def brute_force(keys, sources, targets, key_text="", source_text="", target_text=""):
+    return [entry for entry in range(len(keys))
+            if key_text.casefold() in keys[entry].casefold()
+            and source_text.casefold() in clean_html(sources[entry]).casefold()
+            and target_text.casefold() in targets[entry].casefold()]
+
+
+def make_table(rng, size=300):
+    keys = [f"menu.{rng.choice(WORDS).lower()}.key{entry}" for entry in range(size)]
+    sources = [' '.join(rng.choices(WORDS, k=rng.randint(1, 6))) for _ in range(size)]
+    targets = [' '.join(rng.choices(WORDS, k=rng.randint(0, 4))) for _ in range(size)]
+    return keys, sources, targets
+
+
+def queries(rng):
+    for _ in range(200):
+        word = rng.choice(WORDS + ('', 'er', 'ssw', 'xyz', 'key1', 'mod settings'))
+        start = rng.randint(0, len(word))
+        yield word[start:start + rng.randint(0, len(word))]
+
+
+def test_search_matches_brute_force():
+    rng = random.Random(1)
+    keys, sources, targets = make_table(rng)
+    index = SearchIndex(keys, sources, targets)
+    for query in queries(rng):
+        field = rng.choice(('key_text', 'source_text', 'target_text'))
+        assert index.search(**{field: query}) == brute_force(keys, sources, targets, **{field: query}), (field, query)
+
+
+def test_extended_queries_and_combined_fields():
+    rng = random.Random(2)
+    keys, sources, targets = make_table(rng)
+    index = SearchIndex(keys, sources, targets)
+    index.warm()
+    for word in ('password', 'settings', 'session'):
+        for end in range(1, len(word) + 1):
+            assert index.search(source_text=word[:end]) == brute_force(keys, sources, targets, source_text=word[:end])
+    assert index.search('menu', 'pla', 'o') == brute_force(keys, sources, targets, 'menu', 'pla', 'o')
+
+
+def test_search_after_target_updates():
+    rng = random.Random(3)
+    keys, sources, targets = make_table(rng)
+    index = SearchIndex(keys, sources, targets)
+    assert index.search(target_text='world') == brute_force(keys, sources, targets, target_text='world')
+    for entry in rng.sample(range(len(keys)), 50):
+        targets[entry] = rng.choice(('Neue Welt', 'world peace', ''))
+        index.update_target(entry, targets[entry])
+    for query in ('world', 'wel', 'neue welt', 'e'):
+        assert index.search(target_text=query) == brute_force(keys, sources, targets, target_text=query)
+    targets = [text.upper() for text in targets]
+    index.reset_targets(targets)
+    assert index.search(target_text='world') == brute_force(keys, sources, targets, target_text='world')
@@ -0,0 +1,35 @@
+from source_manifest import build_manifest, diff_sources, load_manifest, save_manifest, source_fingerprint
+
+
+def test_diff_sources_classifies_keys():
+    sources = {'start': "Start game", 'quit': "Quit game", 'options': "Options", 'help': "Help"}
+    translations = {'start': "Spiel starten", 'quit': "Spiel beenden", 'options': "", 'old': "Alt"}
+    manifest = {'start': source_fingerprint("Start game"), 'quit': source_fingerprint("Quit"),
+                'gone': source_fingerprint("Gone")}
+    diff = diff_sources(sources, translations, manifest)
+    assert diff.new == ['options', 'help']
+    assert diff.source_changed == ['quit']
+    assert diff.unchanged == ['start']
+    assert diff.removed == ['old', 'gone']
+
+
+def test_diff_sources_without_manifest_cannot_see_changes():
+    diff = diff_sources({'quit': "Quit game"}, {'quit': "Beenden"}, None)
+    assert diff.source_changed == [] and diff.unchanged == ['quit']
+
+
+def test_build_manifest_keeps_stale_keys_marked():
+    sources = {'start': "Start game", 'quit': "Quit game now"}
+    translations = {'start': "Spiel starten", 'quit': "Spiel beenden", 'old': "Alt"}
+    previous = {'start': source_fingerprint("Start"), 'quit': source_fingerprint("Quit game")}
+    manifest = build_manifest(sources, translations, previous, stale_keys={'quit'})
+    # start was re-translated, quit still predates the source change, old is gone from en.json
+    assert manifest == {'start': source_fingerprint("Start game"), 'quit': source_fingerprint("Quit game")}
+    assert diff_sources(sources, translations, manifest).source_changed == ['quit']
+
+
+def test_manifest_round_trip(tmp_path):
+    target = str(tmp_path / 'de.json')
+    assert load_manifest(target) is None
+    save_manifest(target, {'start': source_fingerprint("Start game")})
+    assert load_manifest(target) == {'start': source_fingerprint("Start game")}
@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from translation_engine import TranslationEngine, TranslationUnavailable
+from translation_backends import (FallbackChain, GlossaryBackend, HedgedTranslator, LatencyTracker, backend_names,
+                                  create_backend, parse_chain, make_translator_factory, HEDGE_MIN_SAMPLES)
+
+
+class Recorder:
+    """Backend that upper-cases text and logs every request"""
+
+    def __init__(self, log, extra_line=False):
+        self.log = log
+        self.extra_line = extra_line
+
+    def translate(self, text):
+        self.log.append(text)
+        if self.extra_line and '\n' in text:
+            # A response that does not split back into the lines it was sent
+            return text.upper() + '\nEXTRA'
+        return text.upper()
+
+
+def write_glossary(tmp_path, entries):
+    path = tmp_path / 'glossary.txt'
+    path.write_text(json.dumps(entries), encoding='utf-8')
+    return str(path)
+
+
+def test_chain_never_misassigns_a_partial_response(tmp_path):
+    glossary = GlossaryBackend(target='de', glossary_path=write_glossary(tmp_path, {'de': {"one": "eins"}}))
+    log = []
+    engine = TranslationEngine(lambda: FallbackChain([glossary, Recorder(log, extra_line=True)]), workers=1, rate=0)
+    results = {key: translated for key, translated, _ in
+               engine.translate_many({'a': "one", 'b': "two", 'c': "three"}, char_limit=100)}
+    assert results == {'a': "eins", 'b': "TWO", 'c': "THREE"}
+    assert log == ["two\nthree", "two", "three"]
+
+
+class Failing:
+    def translate(self, text):
+        raise ConnectionError("offline")
+
+
+class Slow:
+    """Answers 'slow' only after a while, anything else at once"""
+
+    def __init__(self, prefix, delay=1.0):
+        self.prefix = prefix
+        self.delay = delay
+
+    def translate(self, text):
+        if text == 'slow':
+            time.sleep(self.delay)
+        return f"{self.prefix} {text}"
+
+
+def test_registry():
+    assert {'google', 'glossary', 'mock'} <= set(backend_names())
+    assert parse_chain(' glossary, mock ') == ['glossary', 'mock']
+    with pytest.raises(ValueError):
+        parse_chain('glossary,nope')
+    with pytest.raises(ValueError):
+        parse_chain(' , ')
+    with pytest.raises(ValueError):
+        create_backend('nope')
+
+
+def test_mock_backend_keeps_lines():
+    backend = create_backend('mock', target='de', latency=0)
+    assert backend.translate("one\ntwo") == "[de] one\n[de] two"
+    translate = make_translator_factory('mock', 'de', latency=0)()
+    assert translate.translate("three") == "[de] three"
+
+
+def test_chain_uses_backends_in_order():
+    first, second = [], []
+    chain = FallbackChain([Failing(), Recorder(first), Recorder(second)])
+    assert chain.translate("hello") == "HELLO"
+    assert first == ["hello"] and second == []
+    with pytest.raises(ConnectionError):
+        FallbackChain([Failing(), Failing()]).translate("hello")
+
+
+def test_glossary_resolves_a_pack_line_by_line(tmp_path):
+    glossary = GlossaryBackend(target='de',
+                               glossary_path=write_glossary(tmp_path, {'de': {"one": "eins", "three": "drei"}}))
+    log = []
+    chain = FallbackChain([glossary, Recorder(log)])
+    assert chain.translate("one\ntwo\nthree") == "eins\nTWO\ndrei"
+    # Only the line the glossary does not know is sent on
+    assert log == ["two"]
+    assert chain.translate("  one ") == "eins"
+    assert log == ["two"]
+
+
+def test_glossary_miss_falls_through(tmp_path):
+    path = write_glossary(tmp_path, {'german': {"one": "eins"}})
+    log = []
+    assert FallbackChain([GlossaryBackend(target='de', glossary_path=path), Recorder(log)]).translate("two") == "TWO"
+    assert log == ["two"]
+    with pytest.raises(TranslationUnavailable):
+        GlossaryBackend(target='de', glossary_path=path).translate("two")
+    with pytest.raises(TranslationUnavailable):
+        FallbackChain([GlossaryBackend(target='de', glossary_path=path)]).translate("one\ntwo")
+
+
+def test_unavailable_translations_are_not_retried():
+    engine = TranslationEngine(lambda: FallbackChain([GlossaryBackend(target='de', glossary_path='missing.txt')]),
+                               workers=1, rate=0, backoff_base=0)
+    results = list(engine.translate_many({'a': "One", 'b': "Two"}, char_limit=100))
+    assert all(isinstance(error, TranslationUnavailable) for _, _, error in results)
+    # One packed request, then one per key
+    assert engine.requests == 3
+
+
+def test_hedge_wins_against_a_slow_primary():
+    tracker = LatencyTracker()
+    executor = ThreadPoolExecutor(max_workers=4)
+    try:
+        hedged = HedgedTranslator(lambda: Slow('primary'), lambda: Slow('secondary', delay=0), tracker, executor,
+                                  threading.local())
+        for i in range(HEDGE_MIN_SAMPLES):
+            assert hedged.translate(f"fast {i}") == f"primary fast {i}"
+        assert tracker.hedged == 0
+        start = time.perf_counter()
+        assert hedged.translate('slow') == "secondary slow"
+        assert time.perf_counter() - start < 0.5
+        assert (tracker.hedged, tracker.hedge_wins) == (1, 1)
+    finally:
+        executor.shutdown(wait=False)
@@ -0,0 +1,64 @@
+from translation_engine import TranslationEngine, MockTranslator, group_segments, pack_texts
+from translation_stats import RunStats
+
+TEXTS = {f"key{i}": f"Text number {i % 7}" for i in range(40)}
+
+
+def mock_engine(workers=4, max_retries=3, **options):
+    options.setdefault('latency', 0)
+    return TranslationEngine(lambda: MockTranslator(target='de', **options), workers=workers, rate=0,
+                             max_retries=max_retries, backoff_base=0)
+
+
+def test_translate_many_packs_short_texts():
+    engine = mock_engine()
+    results = list(engine.translate_many(TEXTS, char_limit=100))
+    assert sorted(key for key, _, _ in results) == sorted(TEXTS)
+    assert all(error is None and translated == f"[de] {TEXTS[key]}" for key, translated, error in results)
+    assert engine.requests == len(pack_texts(TEXTS, 100)) < len(TEXTS)
+
+
+def test_translate_segments_requests_each_text_once():
+    engine = mock_engine()
+    groups = group_segments(TEXTS)
+    results = list(engine.translate_segments(TEXTS, groups))
+    assert engine.requests == len(groups) == 7
+    assert sorted(key for keys, _, _ in results for key in keys) == sorted(TEXTS)
+    assert all(translated == f"[de] {TEXTS[keys[0]]}" for keys, translated, _ in results)
+
+
+def test_retries_recover_from_failures():
+    engine = mock_engine(error_rate=0.3, seed=4, max_retries=10)
+    stats = RunStats(len(TEXTS))
+    results = list(engine.translate_many(TEXTS, stats=stats))
+    assert all(error is None for _, _, error in results)
+    summary = stats.summary()
+    assert summary['requests'] == engine.requests
+    assert summary['retries'] == summary['failed_requests'] > 0
+
+
+def test_gives_up_after_max_retries():
+    engine = mock_engine(workers=1, error_rate=1.0, max_retries=2)
+    results = list(engine.translate_many({'a': "One", 'b': "Two"}))
+    assert all(translated is None and isinstance(error, ConnectionError) for _, translated, error in results)
+    assert engine.requests == 2 * 3
+
+
+def test_pack_that_does_not_split_back_is_retried_per_key():
+    class LineDropper:
+        def translate(self, text):
+            return text.split('\n')[0].upper()
+
+    engine = TranslationEngine(LineDropper, workers=1, rate=0)
+    results = dict((key, translated) for key, translated, _ in engine.translate_many({'a': "one", 'b': "two"}, 100))
+    assert results == {'a': "ONE", 'b': "TWO"}
+    assert engine.pack_fallbacks == 1
+
+
+def test_failed_pack_is_not_retried_per_key():
+    engine = mock_engine(workers=1, error_rate=1.0, max_retries=2)
+    results = list(engine.translate_many(TEXTS, char_limit=1000))
+    assert sorted(key for key, _, _ in results) == sorted(TEXTS)
+    assert all(isinstance(error, ConnectionError) for _, _, error in results)
+    assert engine.requests == 3
+    assert engine.pack_fallbacks == 0
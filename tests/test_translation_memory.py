@@ -0,0 +1,37 @@
+from translation_memory import TranslationMemory
+
+
+def test_pairs_are_kept_per_backend(tmp_path):
+    memory = TranslationMemory(str(tmp_path / 'memory.sqlite3'))
+    memory.put_many({"Quit game": "[de] Quit game"}, 'de', 'mock')
+    memory.put_many({"Start game": "Spiel starten"}, 'german', 'google')
+    assert memory.pairs('de', 'google') == [("Start game", "Spiel starten")]
+    assert memory.pairs('german', 'mock') == [("Quit game", "[de] Quit game")]
+    assert memory.pairs('de', 'glossary') == []
+    memory.close()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr('translation_memory.time.time', lambda: next(clock))
+    memory = TranslationMemory(str(tmp_path / 'memory.sqlite3'), max_entries=2)
+    memory.put("Start game", 'de', 'mock', "Spiel starten")
+    memory.put("Quit game", 'de', 'mock', "Spiel beenden")
+    # Reading an entry makes it the most recently used
+    assert memory.get("Start game", 'de', 'mock') == "Spiel starten"
+    memory.put("Options", 'de', 'mock', "Optionen")
+    assert memory.get_many(["Start game", "Quit game", "Options"], 'de', 'mock') == {
+        "Start game": "Spiel starten", "Options": "Optionen"}
+    assert memory.stats()['entries'] == 2
+    memory.close()
+
+
+def test_hits_and_misses_are_counted(tmp_path):
+    memory = TranslationMemory(str(tmp_path / 'memory.sqlite3'))
+    assert memory.hit_rate() == 0.0
+    memory.put_many({"Start game": "Spiel starten"}, 'de', 'mock')
+    memory.get_many(["Start game", "Quit game", "Options"], 'de', 'mock')
+    # Another backend's entry does not count as a hit
+    memory.get("Start game", 'de', 'google')
+    assert memory.stats() == {'hits': 1, 'misses': 3, 'hit_rate': 0.25, 'entries': 1}
+    memory.close()
@@ -0,0 +1,48 @@
+import json
+
+from source_manifest import save_manifest, source_fingerprint
+from translation_store import IDENTICAL, MISSING, SOURCE_CHANGED, TranslationStore
+
+SOURCES = {'start': "Start game", 'quit': "Quit game", 'ok': "OK", 'help': "Help"}
+
+
+def load(tmp_path, name, translations, manifest=None):
+    store = TranslationStore(SOURCES)
+    path = str(tmp_path / name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(translations, f)
+    if manifest is not None:
+        save_manifest(path, manifest)
+    column = store.add_column(name, path)
+    store.load_columns([column])
+    return store, column
+
+
+def test_flags_follow_the_target_file(tmp_path):
+    manifest = {'start': source_fingerprint("Start game"), 'quit': source_fingerprint("Quit")}
+    store, column = load(tmp_path, 'de.json', {'start': "Spiel starten", 'quit': "Spiel beenden", 'ok': "OK"},
+                         manifest)
+    assert list(column.flags) == [0, SOURCE_CHANGED, IDENTICAL, MISSING]
+    assert store.stale_keys(column) == {'quit'}
+    assert store.stale_entries([column]) == [1, 2, 3]
+
+
+def test_edits_clear_source_changed(tmp_path):
+    store, column = load(tmp_path, 'de.json', {'start': "Spiel starten", 'quit': "Spiel beenden"},
+                         {'quit': source_fingerprint("Quit")})
+    store.set_target(1, "Spiel verlassen", column)
+    assert not store.has_flag(1, SOURCE_CHANGED, column)
+    assert store.stale_keys(column) == set()
+    assert store.edits(column) == {'quit': "Spiel verlassen"}
+    store.mark_saved(column)
+    assert store.edits(column) == {} and not column.dirty
+
+
+def test_stale_entries_in_any_column(tmp_path):
+    store, german = load(tmp_path, 'de.json', {'start': "Spiel starten", 'quit': "Spiel beenden",
+                                               'ok': "Okay", 'help': "Hilfe"})
+    french = store.add_column('fr.json', str(tmp_path / 'fr.json'))
+    store.load_targets({'start': "Jouer", 'quit': "Quitter", 'ok': "D'accord", 'help': ""}, column=french)
+    assert store.stale_entries([german]) == []
+    assert store.stale_entries([french]) == [3]
+    assert store.stale_entries([german, french]) == [3]
@@ -0,0 +1,39 @@
+import json
+import os
+
+from validation import placeholders, validate_file, language_files
+
+
+def test_placeholders_found():
+    assert placeholders("{0} of {name}") == ['{0}', '{name}']
+    assert placeholders("%s joined with %d items, %1$s at %.2f%%") == ['%.2f', '%1$s', '%d', '%s']
+
+
+def test_percent_in_prose_is_not_a_placeholder():
+    assert placeholders("50% done") == []
+    assert placeholders("50 % fait") == []
+    assert placeholders("100 % d'avancement, 5 % sur la %s") == ['%s']
+
+
+def test_validate_file(tmp_path):
+    sources = {'a': "50% done", 'b': "Hello {0}", 'c': "<b>Bold</b>", 'd': "Missing"}
+    targets = {'a': "50 % fait", 'b': "Bonjour", 'c': "Gras", 'e': "Extra"}
+    (tmp_path / 'en.json').write_text(json.dumps(sources), encoding='utf-8')
+    (tmp_path / 'fr.json').write_text(json.dumps(targets), encoding='utf-8')
+
+    report = validate_file(str(tmp_path / 'en.json'), str(tmp_path / 'fr.json'))
+    issues = report['issues']
+    assert report['lang'] == 'fr'
+    assert issues['missing'] == ['d']
+    assert issues['extra'] == ['e']
+    assert issues['placeholder'] == [{'key': 'b', 'missing': ['{0}'], 'unexpected': []}]
+    assert issues['html'] == [{'key': 'c', 'missing': ['</b>', '<b>'], 'unexpected': []}]
+    assert report['errors'] == 3
+
+
+def test_language_files(tmp_path):
+    for name in ('en.json', 'de.json', 'tr.json', 'zh_CN.json', 'de.json.manifest', 'glossary.txt',
+                 'supported_languages.cache'):
+        (tmp_path / name).write_text('{}', encoding='utf-8')
+    # Any locale the mod ships counts; the tool's own files are not .json
+    assert [os.path.basename(path) for path in language_files(str(tmp_path))] == ['de.json', 'tr.json', 'zh_CN.json']
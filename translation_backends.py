@@ -0,0 +1,304 @@
+"""Translation backends selectable by name, plus fallback chains and hedged requests."""
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, TimeoutError as FutureTimeout, wait
+
+from translation_engine import google_translator, MockTranslator, PACK_SEPARATOR, TranslationUnavailable
+from localization import language_code
+from translation_memory import normalize_source
+
+DEFAULT_BACKEND = 'google'
+# JSON, but not named .json so it is never taken for a language file
+GLOSSARY_FILE = 'glossary.txt'
+# A hedge is only sent once the primary has this many timed requests
+HEDGE_MIN_SAMPLES = 20
+DEFAULT_HEDGE_PERCENTILE = 0.95
+
+BACKENDS = {}
+
+
+def register_backend(name):
+    """Class decorator adding a backend to the registry under name"""
+    def register(cls):
+        cls.name = name
+        BACKENDS[name] = cls
+        return cls
+    return register
+
+
+def backend_names():
+    return list(BACKENDS)
+
+
+def create_backend(name, source='auto', target='en', **options):
+    try:
+        cls = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown translation backend {name!r} (available: {', '.join(BACKENDS)})")
+    return cls(source=source, target=target, **options)
+
+
+def parse_chain(spec):
+    """'glossary,google' -> ['glossary', 'google']"""
+    names = [name.strip() for name in spec.split(',') if name.strip()]
+    for name in names:
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown translation backend {name!r} (available: {', '.join(BACKENDS)})")
+    if not names:
+        raise ValueError("No translation backend given")
+    return names
+
+
+class TranslationBackend:
+    """Interface of a translation backend: translate(text) and the languages it accepts as target"""
+    name = None
+
+    def __init__(self, source='auto', target='en', **options):
+        self.source = source
+        self.target = target
+
+    def translate(self, text):
+        raise NotImplementedError
+
+    def get_supported_languages(self):
+        return []
+
+
+@register_backend('google')
+class GoogleBackend(TranslationBackend):
+    """Google Translate through deep_translator"""
+
+    def __init__(self, source='auto', target='en', **options):
+        super().__init__(source, target)
+        self.translator = google_translator(source=source, target=target)
+
+    def translate(self, text):
+        return self.translator.translate(text)
+
+    def get_supported_languages(self):
+        return list(self.translator.get_supported_languages())
+
+
+@register_backend('mock')
+class MockBackend(TranslationBackend):
+    """Deterministic offline backend for tests: returns '[target] text' after a fixed latency"""
+
+    def __init__(self, source='auto', target='en', latency=0.05, **options):
+        super().__init__(source, target)
+        self.translator = MockTranslator(source, target, latency=latency, seed=0)
+
+    def translate(self, text):
+        return self.translator.translate(text)
+
+
+_glossaries = {}
+_glossaries_lock = threading.Lock()
+
+
+def load_glossary(path):
+    """Read {target language: {source text: translation}} once per file and modification time"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return {}
+    with _glossaries_lock:
+        cached = _glossaries.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read glossary {path}: {str(e)}")
+            data = {}
+        glossary = {}
+        for lang, entries in data.items():
+            if isinstance(entries, dict):
+                glossary.setdefault(language_code(lang), {}).update(
+                    (normalize_source(source), text) for source, text in entries.items())
+        _glossaries[path] = (mtime, glossary)
+        return glossary
+
+
+@register_backend('glossary')
+class GlossaryBackend(TranslationBackend):
+    """Fixed translations from a local glossary file, keyed by language code, name or locale file name.
+
+    Texts missing from the glossary raise TranslationUnavailable, so put it first in a fallback chain.
+    """
+
+    def __init__(self, source='auto', target='en', glossary_path=GLOSSARY_FILE, **options):
+        super().__init__(source, target)
+        self.entries = load_glossary(glossary_path).get(language_code(target), {})
+
+    def lookup(self, text):
+        return self.entries.get(normalize_source(text))
+
+    def translate(self, text):
+        translated = self.lookup(text)
+        if translated is None:
+            raise TranslationUnavailable(f"No glossary entry for {text[:40]!r}")
+        return translated
+
+
+class FallbackChain:
+    """Tries each backend in turn until one succeeds; re-raises the last error if none does.
+
+    Backends with a lookup() (the glossary) resolve packed requests line by
+    line, and only the lines they do not know are passed on.
+    """
+
+    def __init__(self, backends):
+        self.backends = backends
+
+    def translate(self, text):
+        lines = text.split(PACK_SEPARATOR)
+        results = [None] * len(lines)
+        pending = list(range(len(lines)))
+        error = None
+        for backend in self.backends:
+            lookup = getattr(backend, 'lookup', None)
+            if lookup is not None:
+                for i in pending:
+                    results[i] = lookup(lines[i])
+                pending = [i for i in pending if results[i] is None]
+            else:
+                try:
+                    translated = backend.translate(PACK_SEPARATOR.join(lines[i] for i in pending))
+                except Exception as e:
+                    error = e
+                    continue
+                parts = translated.split(PACK_SEPARATOR)
+                if len(parts) != len(pending):
+                    if len(pending) == len(lines):
+                        # Covers the whole text, so the engine can check the split itself
+                        return translated
+                    # Covers only the lines left over, which cannot be told apart any more;
+                    # the engine then asks for each key on its own
+                    raise TranslationUnavailable(f"{len(pending)} lines came back as {len(parts)}")
+                for i, part in zip(pending, parts):
+                    results[i] = part
+                pending = []
+            if not pending:
+                return PACK_SEPARATOR.join(results)
+        raise error or TranslationUnavailable(f"No backend could translate {text[:40]!r}")
+
+
+class LatencyTracker:
+    """Recent request latencies of one backend, shared by every translator of a factory"""
+
+    def __init__(self, window=500):
+        self.samples = deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def add(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+
+    def percentile(self, q):
+        """Latency below which a fraction q of recent requests finished, or None without enough data"""
+        with self.lock:
+            if len(self.samples) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class HedgedTranslator:
+    """Races a second backend when the first is slower than its usual latency percentile.
+
+    Both run on a pool shared by the factory; each pool thread keeps its own
+    translator objects, since a losing request keeps running in the background.
+    """
+
+    def __init__(self, primary_factory, secondary_factory, tracker, executor, local,
+                 percentile=DEFAULT_HEDGE_PERCENTILE):
+        self.primary_factory = primary_factory
+        self.secondary_factory = secondary_factory
+        self.tracker = tracker
+        self.executor = executor
+        self.local = local
+        self.percentile = percentile
+
+    def _translator(self, attr, factory):
+        translator = getattr(self.local, attr, None)
+        if translator is None:
+            translator = factory()
+            setattr(self.local, attr, translator)
+        return translator
+
+    def _primary(self, text):
+        start = time.perf_counter()
+        translated = self._translator('primary', self.primary_factory).translate(text)
+        self.tracker.add(time.perf_counter() - start)
+        return translated
+
+    def _secondary(self, text):
+        return self._translator('secondary', self.secondary_factory).translate(text)
+
+    def translate(self, text):
+        first = self.executor.submit(self._primary, text)
+        try:
+            return first.result(timeout=self.tracker.percentile(self.percentile))
+        except FutureTimeout:
+            pass
+        with self.tracker.lock:
+            self.tracker.hedged += 1
+        second = self.executor.submit(self._secondary, text)
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    translated = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if future is second:
+                    with self.tracker.lock:
+                        self.tracker.hedge_wins += 1
+                return translated
+        raise error
+
+
+def make_translator_factory(spec=DEFAULT_BACKEND, target='en', hedge=None,
+                            hedge_percentile=DEFAULT_HEDGE_PERCENTILE, **options):
+    """Return a factory for TranslationEngine building the backend (or chain) described by spec.
+
+    spec is a backend name or a comma separated fallback chain such as
+    'glossary,google'. With hedge set to another spec, requests slower than
+    hedge_percentile of recent ones are raced against that backend.
+    """
+    names = parse_chain(spec)
+
+    def build():
+        backends = [create_backend(name, target=target, **options) for name in names]
+        return backends[0] if len(backends) == 1 else FallbackChain(backends)
+
+    if not hedge:
+        return build
+    secondary = make_translator_factory(hedge, target, **options)
+    tracker = LatencyTracker()
+    executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='hedge')
+    local = threading.local()
+
+    def build_hedged():
+        return HedgedTranslator(build, secondary, tracker, executor, local, hedge_percentile)
+
+    build_hedged.tracker = tracker
+    return build_hedged
+
+
+def supported_languages(spec=DEFAULT_BACKEND, **options):
+    """Target languages of the first backend in spec that can list them"""
+    for name in parse_chain(spec):
+        languages = create_backend(name, **options).get_supported_languages()
+        if languages:
+            return languages
+    return []
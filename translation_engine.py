@@ -0,0 +1,417 @@
+import heapq
+import itertools
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from translation_memory import normalize_source
+
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 8.0  # requests per second across all workers
+DEFAULT_MAX_RETRIES = 3
+# Characters per packed request; Google Translate rejects requests over 5000
+DEFAULT_PACK_CHARS = 4500
+# Short texts are packed one per line; translators keep line breaks intact
+PACK_SEPARATOR = '\n'
+# RequestScheduler priorities; lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+
+class TranslationUnavailable(LookupError):
+    """The backend has no translation for a text (e.g. a glossary miss); retrying cannot help"""
+
+
+def google_translator(source='auto', target='en'):
+    """Create a GoogleTranslator, importing deep_translator on first use"""
+    from deep_translator import GoogleTranslator
+    return GoogleTranslator(source=source, target=target)
+
+
+def group_segments(texts):
+    """Group a {key: text} mapping by normalized text: {segment: [keys]} in first-seen order.
+
+    Each segment only needs to be translated once; the result applies to all its keys.
+    """
+    groups = {}
+    for key, text in texts.items():
+        segment = normalize_source(text)
+        keys = groups.get(segment)
+        if keys is None:
+            groups[segment] = [key]
+        else:
+            keys.append(key)
+    return groups
+
+
+def reuse_translations(texts, groups, memory=None, target_lang=None, backend=None, fuzzy=None):
+    """Yield (keys, translation, 'memory' or 'fuzzy') for the segments of groups that need no request.
+
+    Segments are served from the translation memory first, then from
+    near-exact matches in fuzzy (a FuzzyMemory, waited for until indexed).
+    Each one served is removed from groups ({segment: [keys]} as
+    group_segments returns it), which is left holding what to translate.
+    """
+    if memory is not None and groups:
+        hits = memory.get_many([texts[keys[0]] for keys in groups.values()], target_lang, backend)
+        for segment, keys in list(groups.items()):
+            translated = hits.get(texts[keys[0]])
+            if translated is not None:
+                del groups[segment]
+                yield keys, translated, 'memory'
+    # Sources differing from an earlier one only in case, punctuation or numbers reuse its translation
+    if fuzzy is not None and groups:
+        fuzzy.ready.wait()
+        for segment, keys in list(groups.items()):
+            match = fuzzy.near_exact(texts[keys[0]])
+            if match is not None:
+                del groups[segment]
+                yield keys, match.target, 'fuzzy'
+
+
+def pack_texts(texts, char_limit=DEFAULT_PACK_CHARS):
+    """Split the keys of {key: text} into packs whose joined texts fit in char_limit characters.
+
+    Texts containing line breaks or too long to share a request get a pack of their own.
+    """
+    packs = []
+    current = []
+    size = 0
+    for key, text in texts.items():
+        if len(text) * 2 > char_limit or '\n' in text or '\r' in text or not text.strip():
+            packs.append([key])
+            continue
+        if current and size + len(PACK_SEPARATOR) + len(text) > char_limit:
+            packs.append(current)
+            current = []
+            size = 0
+        size += len(text) + (len(PACK_SEPARATOR) if current else 0)
+        current.append(key)
+    if current:
+        packs.append(current)
+    return packs
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how many requests start per second"""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it; returns the seconds spent waiting"""
+        if self.rate <= 0:
+            return 0.0
+        start = time.monotonic()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return now - start
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class TranslationEngine:
+    """Translates many texts concurrently with rate limiting and retries.
+
+    translator_factory is called once per worker thread and must return an
+    object with a translate(text) method, e.g. a configured GoogleTranslator.
+    """
+
+    def __init__(self, translator_factory, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=0.5, backoff_max=8.0):
+        self.translator_factory = translator_factory
+        self.workers = max(1, int(workers))
+        self.bucket = TokenBucket(rate)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._local = threading.local()
+        self.lock = threading.Lock()
+        # Backend calls made, and packs whose response had to be re-requested key by key
+        self.requests = 0
+        self.pack_fallbacks = 0
+
+    def _translator(self):
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self.translator_factory()
+            self._local.translator = translator
+        return translator
+
+    def backoff_delay(self, attempt):
+        """Exponential backoff with jitter for the given retry attempt (0-based)"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.0)
+
+    def translate(self, text, stats=None):
+        """Translate one text, retrying with backoff; re-raises the last error.
+
+        TranslationUnavailable is re-raised at once. Every attempt is recorded
+        in stats (a RunStats) if one is given.
+        """
+        attempt = 0
+        while True:
+            waited = self.bucket.acquire()
+            with self.lock:
+                self.requests += 1
+            start = time.perf_counter()
+            try:
+                translated = self._translator().translate(text)
+            except Exception as e:
+                if stats is not None:
+                    stats.record_request(start, time.perf_counter() - start, text, attempt, waited, e)
+                if attempt >= self.max_retries or isinstance(e, TranslationUnavailable):
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+            if stats is not None:
+                stats.record_request(start, time.perf_counter() - start, text, attempt, waited)
+            return translated
+
+    def translate_pack(self, keys, texts, stats=None):
+        """Translate texts[key] for keys in one request, returning [(key, translated, error)].
+
+        If the response does not split back into one line per key, or the
+        backend has no translation for all of it, the pack is translated again
+        one key at a time. Any other error is returned for every key.
+        """
+        if len(keys) > 1:
+            try:
+                parts = self.translate(PACK_SEPARATOR.join(texts[key] for key in keys), stats).split(PACK_SEPARATOR)
+            except TranslationUnavailable:
+                parts = None
+            except Exception as e:
+                # The retries are spent; requesting each key would multiply traffic to a failing backend
+                return [(key, None, e) for key in keys]
+            if parts is not None and len(parts) == len(keys) and all(part.strip() for part in parts):
+                return [(key, part.strip(), None) for key, part in zip(keys, parts)]
+            with self.lock:
+                self.pack_fallbacks += 1
+        results = []
+        for key in keys:
+            try:
+                results.append((key, self.translate(texts[key], stats), None))
+            except Exception as e:
+                results.append((key, None, e))
+        return results
+
+    def translate_segments(self, texts, groups=None, char_limit=0, scheduler=None, priority=PRIORITY_BATCH,
+                           control=None, stats=None):
+        """Like translate_many, but texts sharing a segment are requested only once.
+
+        Yields (keys, translated, error) for each unique segment, where keys
+        lists every key of texts using it.
+        """
+        groups = groups if groups is not None else group_segments(texts)
+        unique = {keys[0]: texts[keys[0]] for keys in groups.values()}
+        keys_by_first = {keys[0]: keys for keys in groups.values()}
+        for key, translated, error in self.translate_many(unique, char_limit, scheduler, priority, control, stats):
+            yield keys_by_first[key], translated, error
+
+    def translate_many(self, texts, char_limit=0, scheduler=None, priority=PRIORITY_BATCH, control=None,
+                       stats=None):
+        """Translate a {key: text} mapping, yielding (key, translated, error) as each completes.
+
+        Exactly one of translated and error is None. With a char_limit, short
+        texts are packed into shared requests of up to that many characters.
+        Requests run on scheduler's shared workers at the given priority if
+        one is passed, otherwise on a private thread pool. A BatchControl can
+        pause (scheduler only) or cancel the batch, and a RunStats records the
+        timing of every request. Closing the generator early cancels requests
+        that have not started yet.
+        """
+        packs = pack_texts(texts, char_limit) if char_limit else [[key] for key in texts]
+        if scheduler is not None:
+            yield from scheduler.map(self, packs, texts, priority, control, stats)
+            return
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {executor.submit(self.translate_pack, keys, texts, stats): keys for keys in packs}
+            for future in as_completed(futures):
+                if control is not None and control.cancelled:
+                    return
+                yield from future.result()
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class ScheduledJob:
+    """One pack of keys waiting in a RequestScheduler"""
+    __slots__ = ('engine', 'keys', 'texts', 'callback', 'control', 'stats', 'cancelled')
+
+    def __init__(self, engine, keys, texts, callback, control=None, stats=None):
+        self.engine = engine
+        self.keys = keys
+        self.texts = texts
+        self.callback = callback
+        self.control = control
+        self.stats = stats
+        self.cancelled = False
+
+
+class BatchControl:
+    """Pause and cancel switch shared by the requests of one batch.
+
+    Pausing parks queued requests of the batch as workers reach them; requests
+    already running still finish and deliver their results.
+    """
+
+    def __init__(self):
+        self.scheduler = None
+        self.paused = False
+        self.cancelled = False
+        self.parked = []
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        if self.scheduler is not None:
+            self.scheduler.unpark(self)
+        else:
+            self.paused = False
+
+    def cancel(self):
+        self.cancelled = True
+        self.resume()
+
+
+class RequestScheduler:
+    """Shared worker threads that serve translation requests in priority order.
+
+    Lower priorities run first and equal priorities run in submission order,
+    so an interactive request overtakes a queued batch. Workers live as long
+    as the scheduler, so each keeps its translator objects between requests.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = max(1, int(workers))
+        self.heap = []
+        self.counter = itertools.count()
+        self.condition = threading.Condition()
+        self.threads = {}
+        self.closed = False
+
+    def set_workers(self, workers):
+        with self.condition:
+            self.workers = max(1, int(workers))
+            if self.heap:
+                self._start_threads()
+            self.condition.notify_all()
+
+    def _start_threads(self):
+        for index in range(self.workers):
+            if index not in self.threads:
+                thread = threading.Thread(target=self._run, args=(index,), daemon=True,
+                                          name=f'translation-worker-{index}')
+                self.threads[index] = thread
+                thread.start()
+
+    def submit(self, engine, keys, texts, callback, priority=PRIORITY_BATCH, control=None, stats=None):
+        """Queue engine.translate_pack(keys, texts); callback gets its results on a worker thread"""
+        job = ScheduledJob(engine, keys, texts, callback, control, stats)
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("Scheduler is shut down")
+            self._start_threads()
+            heapq.heappush(self.heap, (priority, next(self.counter), job))
+            self.condition.notify()
+        return job
+
+    def map(self, engine, packs, texts, priority=PRIORITY_BATCH, control=None, stats=None):
+        """Queue every pack and yield (key, translated, error) as packs complete"""
+        results = queue.Queue()
+        if control is not None:
+            control.scheduler = self
+        jobs = [self.submit(engine, keys, texts, results.put, priority, control, stats) for keys in packs]
+        try:
+            remaining = len(jobs)
+            while remaining:
+                if control is not None and control.cancelled:
+                    return
+                try:
+                    packed = results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                remaining -= 1
+                yield from packed
+        finally:
+            for job in jobs:
+                job.cancelled = True
+
+    def unpark(self, control):
+        """Resume a paused batch by putting its parked requests back in the queue"""
+        with self.condition:
+            control.paused = False
+            for item in control.parked:
+                heapq.heappush(self.heap, item)
+            if control.parked:
+                control.parked = []
+                self._start_threads()
+                self.condition.notify_all()
+
+    def pending(self):
+        with self.condition:
+            return sum(1 for _, _, job in self.heap if not job.cancelled)
+
+    def shutdown(self):
+        with self.condition:
+            self.closed = True
+            for _, _, job in self.heap:
+                job.cancelled = True
+            self.heap.clear()
+            self.condition.notify_all()
+
+    def _run(self, index):
+        while True:
+            with self.condition:
+                while not self.closed and index < self.workers and not self.heap:
+                    self.condition.wait()
+                if self.closed or index >= self.workers:
+                    del self.threads[index]
+                    return
+                item = heapq.heappop(self.heap)
+                job = item[2]
+                if job.control is not None and job.control.paused and not job.control.cancelled:
+                    job.control.parked.append(item)
+                    continue
+            if job.cancelled or (job.control is not None and job.control.cancelled):
+                continue
+            results = job.engine.translate_pack(job.keys, job.texts, job.stats)
+            try:
+                job.callback(results)
+            except Exception as e:
+                print(f"Translation callback failed: {str(e)}")
+
+
+class MockTranslator:
+    """Local stand-in backend that injects latency and random failures"""
+
+    def __init__(self, source='auto', target='en', latency=0.05, jitter=0.0, error_rate=0.0, seed=None):
+        self.source = source
+        self.target = target
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+
+    def translate(self, text):
+        self.calls += 1
+        time.sleep(self.latency + self.random.uniform(0, self.jitter))
+        if self.random.random() < self.error_rate:
+            raise ConnectionError(f"Injected failure translating {text[:20]!r}")
+        # Line by line, like a real backend keeps the line structure of packed requests
+        return PACK_SEPARATOR.join(f"[{self.target}] {line}" for line in text.split(PACK_SEPARATOR))
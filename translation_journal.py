@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import time
+
+# Append-only log of Translate All results that have not been saved yet
+JOURNAL_FILE = 'translation_journal.jsonl'
+JOURNAL_FLUSH_EVERY = 100   # records buffered before they are written out
+JOURNAL_FLUSH_SECONDS = 2.0  # ...or this long after the last write; owners call flush() on a timer too
+
+
+class JournalRun:
+    """One Translate All run read back from a journal"""
+
+    def __init__(self, lang, column, path, keys):
+        self.lang = lang
+        self.column = column
+        self.path = path
+        self.keys = keys
+        self.done = {}
+        self.finished = False
+
+    def remaining(self):
+        return [key for key in self.keys if key not in self.done]
+
+
+class TranslationJournal:
+    """Appends (key, translation) records of Translate All runs to a JSONL file.
+
+    Each run starts with a header naming the language, the target file and
+    the keys requested. Records are buffered and flushed in batches, so a
+    crash loses at most the last batch. record() can only flush when a result
+    arrives, so whoever drives a run also calls flush() every
+    JOURNAL_FLUSH_SECONDS while it runs. A torn last line is ignored on load.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.buffer = []
+        self.flushed = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _append(self, record):
+        self.buffer.append(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def start(self, lang, column, target_path, keys):
+        with self.lock:
+            self._append({'lang': lang, 'column': column, 'path': target_path, 'keys': list(keys)})
+            self._flush()
+
+    def record(self, key, text):
+        with self.lock:
+            self._append({'key': key, 'text': text})
+            if (len(self.buffer) >= JOURNAL_FLUSH_EVERY
+                    or time.monotonic() - self.flushed >= JOURNAL_FLUSH_SECONDS):
+                self._flush()
+
+    def finish(self, status):
+        """Mark the current run 'completed' or 'cancelled' and write everything out"""
+        with self.lock:
+            self._append({'end': status})
+            self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(''.join(self.buffer))
+                f.flush()
+                os.fsync(f.fileno())
+            self.buffer = []
+        self.flushed = time.monotonic()
+
+    def discard(self):
+        """Forget every run, e.g. once their results were saved"""
+        with self.lock:
+            self.buffer = []
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def load_journal(path):
+    """Return the JournalRuns recorded in path, oldest first ([] if there is no journal)"""
+    runs = []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if 'keys' in record:
+                    runs.append(JournalRun(record.get('lang'), record.get('column'),
+                                           record.get('path'), record['keys']))
+                elif not runs:
+                    continue
+                elif 'key' in record:
+                    runs[-1].done[record['key']] = record['text']
+                elif 'end' in record:
+                    runs[-1].finished = True
+    except OSError:
+        return []
+    return runs
@@ -0,0 +1,156 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+
+from localization import language_code
+
+TRANSLATION_MEMORY_FILE = 'translation_memory.sqlite3'
+DEFAULT_MAX_ENTRIES = 200000
+
+
+def normalize_source(text):
+    """Normalize source text so trivial whitespace/Unicode differences share an entry"""
+    text = unicodedata.normalize('NFC', str(text))
+    return ' '.join(text.split())
+
+
+def source_hash(text):
+    return hashlib.sha1(normalize_source(text).encode('utf-8')).hexdigest()
+
+
+class TranslationMemory:
+    """On-disk cache of translations keyed by (source hash, target language, backend).
+
+    Target languages may be given as codes, names or locale file names; they
+    are stored as codes, so the GUI and the command line share entries.
+
+    Entries are evicted least-recently-used first once max_entries is exceeded.
+    Safe to share between the GUI thread and worker threads.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                source_hash TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                backend TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                source TEXT,
+                PRIMARY KEY (source_hash, target_lang, backend)
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)')
+        # Caches created before fuzzy suggestions only stored the hash of the source
+        columns = [row[1] for row in self.conn.execute('PRAGMA table_info(translations)')]
+        if 'source' not in columns:
+            try:
+                self.conn.execute('ALTER TABLE translations ADD COLUMN source TEXT')
+            except sqlite3.OperationalError:
+                # Another process (e.g. a parallel CLI worker) added it first
+                pass
+        self.conn.commit()
+        self.entries = self.conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    def get(self, text, target_lang, backend):
+        return self.get_many([text], target_lang, backend).get(text)
+
+    def get_many(self, texts, target_lang, backend):
+        """Return {text: translation} for every text found in the cache"""
+        target_lang = language_code(target_lang)
+        hashes = {}
+        for text in texts:
+            hashes.setdefault(source_hash(text), []).append(text)
+        found = {}
+        with self.lock:
+            hash_list = list(hashes)
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(hash_list), 500):
+                chunk = hash_list[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self.conn.execute(
+                    f'SELECT source_hash, translation FROM translations '
+                    f'WHERE target_lang = ? AND backend = ? AND source_hash IN ({placeholders})',
+                    [target_lang, backend, *chunk]
+                ).fetchall()
+                for digest, translation in rows:
+                    for text in hashes[digest]:
+                        found[text] = translation
+                if rows:
+                    now = time.time()
+                    self.conn.executemany(
+                        'UPDATE translations SET last_used = ? '
+                        'WHERE source_hash = ? AND target_lang = ? AND backend = ?',
+                        [(now, digest, target_lang, backend) for digest, _ in rows]
+                    )
+            self.conn.commit()
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put(self, text, target_lang, backend, translation):
+        self.put_many({text: translation}, target_lang, backend)
+
+    def put_many(self, translations, target_lang, backend):
+        """Store a {text: translation} mapping and evict old entries if over capacity"""
+        if not translations:
+            return
+        target_lang = language_code(target_lang)
+        now = time.time()
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO translations '
+                '(source_hash, target_lang, backend, translation, last_used, source) VALUES (?, ?, ?, ?, ?, ?)',
+                [(source_hash(text), target_lang, backend, translation, now, normalize_source(text))
+                 for text, translation in translations.items()]
+            )
+            self.conn.commit()
+            if self.conn.total_changes - before:
+                self.entries = self.conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+            if self.entries > self.max_entries:
+                self._evict(self.entries - self.max_entries)
+
+    def pairs(self, target_lang, backend):
+        """(source, translation) of every entry cached for target_lang by backend, most recently used first"""
+        with self.lock:
+            return self.conn.execute(
+                'SELECT source, translation FROM translations '
+                'WHERE target_lang = ? AND backend = ? AND source IS NOT NULL ORDER BY last_used DESC',
+                (language_code(target_lang), backend)
+            ).fetchall()
+
+    def _evict(self, count):
+        self.conn.execute(
+            'DELETE FROM translations WHERE rowid IN '
+            '(SELECT rowid FROM translations ORDER BY last_used LIMIT ?)',
+            (count,)
+        )
+        self.conn.commit()
+        self.entries -= count
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate(),
+            'entries': self.entries,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
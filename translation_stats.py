@@ -0,0 +1,170 @@
+import csv
+import json
+import threading
+import time
+
+from translation_engine import PACK_SEPARATOR
+
+# Kept per run, so the stats panel can say what went wrong without the console
+MAX_ERRORS_KEPT = 100
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class RequestRecord:
+    """One backend call: when it started, how long it took and what it carried"""
+    __slots__ = ('offset', 'seconds', 'lines', 'chars', 'attempt', 'waited', 'error')
+    FIELDS = __slots__
+
+    def __init__(self, offset, seconds, lines, chars, attempt, waited, error):
+        self.offset = offset
+        self.seconds = seconds
+        self.lines = lines
+        self.chars = chars
+        self.attempt = attempt
+        self.waited = waited
+        self.error = error
+
+
+class RunStats:
+    """Timings and counters of one Translate All run, updated from worker threads.
+
+    The engine records every backend call (including failed attempts that
+    were retried); the run records how each key was served, and the GUI how
+    long it spent applying results.
+    """
+
+    def __init__(self, total_keys=0, target_lang=None, backend=None):
+        self.total_keys = total_keys
+        self.target_lang = target_lang
+        self.backend = backend
+        self.started = time.time()
+        self.start = time.perf_counter()
+        self.end = None
+        self.requests = []
+        self.keys = {'backend': 0, 'memory': 0, 'fuzzy': 0}
+        self.chars = 0
+        self.failed_keys = 0
+        self.errors = []
+        self.ui_seconds = 0.0
+        self.ui_batches = 0
+        self.lock = threading.Lock()
+
+    def record_request(self, started, seconds, text, attempt=0, waited=0.0, error=None):
+        """Record one backend call of text (possibly a pack) that started at perf_counter() time started"""
+        record = RequestRecord(started - self.start, seconds, text.count(PACK_SEPARATOR) + 1, len(text), attempt,
+                               waited, None if error is None else str(error))
+        with self.lock:
+            self.requests.append(record)
+
+    def add_keys(self, count, chars, source='backend'):
+        """Count keys served by the backend, the translation 'memory' or a 'fuzzy' match"""
+        with self.lock:
+            self.keys[source] += count
+            self.chars += chars
+
+    def add_failed(self, keys, error):
+        with self.lock:
+            self.failed_keys += len(keys)
+            if len(self.errors) < MAX_ERRORS_KEPT:
+                self.errors.append({'keys': list(keys), 'error': str(error)})
+
+    def record_ui(self, seconds):
+        with self.lock:
+            self.ui_seconds += seconds
+            self.ui_batches += 1
+
+    def finish(self):
+        self.end = time.perf_counter()
+
+    def elapsed(self):
+        return (self.end or time.perf_counter()) - self.start
+
+    def summary(self):
+        """JSON-serializable snapshot; safe to call while the run is going"""
+        with self.lock:
+            requests = list(self.requests)
+            keys = dict(self.keys)
+            chars = self.chars
+            failed_keys = self.failed_keys
+            errors = list(self.errors)
+        elapsed = self.elapsed()
+        done = sum(keys.values())
+        latencies = sorted(record.seconds for record in requests if record.error is None)
+        percentiles = {f'p{round(q * 100)}': latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+                       if latencies else None for q in PERCENTILES}
+        return {
+            'started': self.started,
+            'target_lang': self.target_lang,
+            'backend': self.backend,
+            'running': self.end is None,
+            'seconds': elapsed,
+            'total_keys': self.total_keys,
+            'done_keys': done,
+            'failed_keys': failed_keys,
+            'keys': keys,
+            'keys_per_second': done / elapsed if elapsed else 0.0,
+            'chars_per_second': chars / elapsed if elapsed else 0.0,
+            'requests': len(requests),
+            'failed_requests': sum(1 for record in requests if record.error is not None),
+            'retries': sum(1 for record in requests if record.attempt),
+            'latency': dict(percentiles, mean=sum(latencies) / len(latencies) if latencies else None,
+                            max=latencies[-1] if latencies else None),
+            'rate_limit_wait': sum(record.waited for record in requests),
+            'cache_hit_rate': keys['memory'] / (done + failed_keys) if done + failed_keys else 0.0,
+            'ui_seconds': self.ui_seconds,
+            'ui_batches': self.ui_batches,
+            'errors': errors,
+        }
+
+    def write_json(self, path):
+        """Summary plus every request of the run"""
+        report = self.summary()
+        with self.lock:
+            report['request_log'] = [{field: getattr(record, field) for field in RequestRecord.FIELDS}
+                                     for record in self.requests]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    def write_csv(self, path):
+        """One row per backend call"""
+        with self.lock:
+            rows = [[getattr(record, field) for field in RequestRecord.FIELDS] for record in self.requests]
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(RequestRecord.FIELDS)
+            writer.writerows(rows)
+
+
+def _seconds(value):
+    return '-' if value is None else f"{value:.2f}s"
+
+
+def format_summary(summary):
+    """Multi-line description of a summary() for the stats panel"""
+    latency = summary['latency']
+    keys = summary['keys']
+    state = 'running' if summary['running'] else 'finished'
+    lines = [
+        f"{summary['target_lang']} via {summary['backend']}: {summary['done_keys']}/{summary['total_keys']} keys, "
+        f"{state} after {summary['seconds']:.1f}s",
+        f"Throughput: {summary['keys_per_second']:.1f} keys/s, {summary['chars_per_second']:.0f} chars/s",
+        f"Requests: {summary['requests']} ({summary['failed_requests']} failed, {summary['retries']} retries)",
+        "Latency: " + ", ".join(f"{name} {_seconds(latency[name])}" for name in latency),
+        f"Waiting for the rate limit: {summary['rate_limit_wait']:.1f}s across all requests",
+        f"Served by the backend: {keys['backend']}, translation memory: {keys['memory']} "
+        f"({summary['cache_hit_rate']:.0%}), near-identical strings: {keys['fuzzy']}, "
+        f"failed: {summary['failed_keys']}",
+        f"Table updates: {summary['ui_batches']} batches, {summary['ui_seconds']:.2f}s",
+    ]
+    if summary['errors']:
+        lines.append("")
+        lines.append("Errors:")
+        lines.extend(f"  {', '.join(error['keys'][:3])}: {error['error']}" for error in summary['errors'][-10:])
+    return "\n".join(lines)
+
+
+def format_status(summary):
+    """One line for the status bar while a run is going"""
+    return (f"Translating... {summary['done_keys']}/{summary['total_keys']} keys, "
+            f"{summary['keys_per_second']:.1f} keys/s, p95 {_seconds(summary['latency']['p95'])}, "
+            f"{summary['failed_requests']} errors, {summary['retries']} retries")
@@ -0,0 +1,208 @@
+import os
+import sys
+
+from localization import load_flat_json
+from source_manifest import load_manifest, diff_sources
+
+# Status bits kept per entry in LanguageColumn.flags
+MISSING = 1          # key absent from the loaded target file
+IDENTICAL = 2        # translation equals the source text (needs translation)
+SOURCE_CHANGED = 4   # en.json text changed since the translation was made
+STATUS_BITS = MISSING | IDENTICAL | SOURCE_CHANGED
+
+DEFAULT_COLUMN_NAME = "Translation"
+
+
+class LanguageColumn:
+    """Translations of one target file; targets and flags stay None until loaded.
+
+    edited holds the entries changed since the file was loaded or saved;
+    error why the file could not be parsed, if it could not.
+    """
+    __slots__ = ('name', 'path', 'targets', 'flags', 'manifest', 'dirty', 'edited', 'error')
+
+    def __init__(self, name, path=None):
+        self.name = name
+        self.path = path
+        self.targets = None
+        self.flags = None
+        self.manifest = None
+        self.dirty = False
+        self.edited = set()
+        self.error = None
+
+    @property
+    def loaded(self):
+        return self.targets is not None
+
+
+class TranslationStore:
+    """GUI-independent table of keys and source texts shared by any number of language columns.
+
+    Entries are stored as parallel arrays indexed by position in en.json.
+    Each LanguageColumn keeps its own targets list and a bytearray of the
+    status bits above. One column is active: it is the one edited, translated
+    and saved, and targets/flags refer to it.
+    """
+    __slots__ = ('keys', 'sources', 'index', 'columns', 'active')
+
+    def __init__(self, flat_sources):
+        self.keys = [sys.intern(key) for key in flat_sources]
+        self.sources = [str(value) for value in flat_sources.values()]
+        self.index = {key: entry for entry, key in enumerate(self.keys)}
+        self.columns = []
+        self.active = self.add_column(DEFAULT_COLUMN_NAME)
+        self._reset(self.active)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def targets(self):
+        return self.active.targets
+
+    @property
+    def flags(self):
+        return self.active.flags
+
+    def _reset(self, column):
+        column.targets = [''] * len(self.keys)
+        column.flags = bytearray(len(self.keys))
+
+    def add_column(self, name, path=None):
+        """Register a language column; its file is only parsed by load_columns"""
+        column = LanguageColumn(name, path)
+        self.columns.append(column)
+        return column
+
+    def column_for_path(self, path):
+        path = os.path.abspath(path)
+        for column in self.columns:
+            if column.path and os.path.abspath(column.path) == path:
+                return column
+        return None
+
+    def side_columns(self):
+        return [column for column in self.columns if column is not self.active]
+
+    def loaded_columns(self):
+        return [column for column in self.columns if column.loaded]
+
+    def set_active(self, column):
+        if not column.loaded:
+            self.load_columns([column])
+        self.active = column
+
+    def source_map(self):
+        return dict(zip(self.keys, self.sources))
+
+    def load_columns(self, columns):
+        """Parse the target files of columns, then fill all of them in one pass over the keys.
+
+        Returns {column: SourceDiff} describing each file against en.json.
+        """
+        sources = None
+        parsed = []
+        diffs = {}
+        for column in columns:
+            try:
+                flat = load_flat_json(column.path)
+            except Exception as e:
+                # Left unloaded, so nothing can overwrite the file with an empty column
+                column.error = str(e)
+                raise
+            column.manifest = load_manifest(column.path)
+            if sources is None:
+                sources = self.source_map()
+            diffs[column] = diff_sources(sources, flat, column.manifest)
+            parsed.append((column, flat, set(diffs[column].source_changed)))
+        self._fill(parsed)
+        return diffs
+
+    def load_targets(self, flat_targets, source_changed_keys=(), column=None):
+        """Replace every translation of column (default: active) from a flat mapping"""
+        self._fill([(column or self.active, flat_targets, set(source_changed_keys))])
+
+    def _fill(self, parsed):
+        for column, _, _ in parsed:
+            self._reset(column)
+        for entry, (key, source) in enumerate(zip(self.keys, self.sources)):
+            for column, flat, source_changed_keys in parsed:
+                value = flat.get(key)
+                if value is None:
+                    column.flags[entry] = MISSING
+                    continue
+                text = str(value)
+                column.targets[entry] = text
+                status = IDENTICAL if text == source else 0
+                if key in source_changed_keys:
+                    status |= SOURCE_CHANGED
+                column.flags[entry] = status
+        for column, _, _ in parsed:
+            column.dirty = False
+            column.edited.clear()
+            column.error = None
+
+    def set_target(self, entry, text, column=None):
+        """Store an edited or freshly translated text; it no longer reflects an old source"""
+        column = column or self.active
+        column.targets[entry] = text
+        column.flags[entry] &= ~SOURCE_CHANGED & 0xFF
+        column.dirty = True
+        column.edited.add(entry)
+
+    def has_flag(self, entry, flag, column=None):
+        return bool((column or self.active).flags[entry] & flag)
+
+    def is_stale(self, entry, column=None):
+        """True if the entry has no usable translation or its source changed since"""
+        column = column or self.active
+        return bool(column.flags[entry]) or not column.targets[entry]
+
+    def stale_entries(self, columns=None):
+        """Entries stale in any of columns (default: the active one), in a single pass"""
+        columns = columns or [self.active]
+        if len(columns) == 1:
+            flags, targets = columns[0].flags, columns[0].targets
+            return [entry for entry, (status, text) in enumerate(zip(flags, targets))
+                    if status or not text]
+        return [entry for entry in range(len(self.keys))
+                if any(column.flags[entry] or not column.targets[entry] for column in columns)]
+
+    def stale_keys(self, column=None):
+        """Keys whose translation predates a change of their source text"""
+        column = column or self.active
+        return {self.keys[entry] for entry, status in enumerate(column.flags) if status & SOURCE_CHANGED}
+
+    def edits(self, column=None):
+        """{key: translation} of the entries edited since the column was loaded or saved"""
+        column = column or self.active
+        return {self.keys[entry]: column.targets[entry] for entry in column.edited}
+
+    def mark_saved(self, column=None):
+        column = column or self.active
+        column.dirty = False
+        column.edited.clear()
+
+    def translations(self, column=None):
+        """{key: translation} for every non-empty translation, in en.json order"""
+        column = column or self.active
+        return {key: text for key, text in zip(self.keys, column.targets) if text}
+
+    def status_counts(self, columns=None):
+        """Per-column counts of each status, computed for all columns in one pass"""
+        columns = columns or [self.active]
+        counts = [{'total': len(self.keys), 'missing': 0, 'identical': 0, 'source_changed': 0, 'empty': 0}
+                  for _ in columns]
+        for entry in range(len(self.keys)):
+            for column, column_counts in zip(columns, counts):
+                status = column.flags[entry]
+                if status & MISSING:
+                    column_counts['missing'] += 1
+                if status & IDENTICAL:
+                    column_counts['identical'] += 1
+                if status & SOURCE_CHANGED:
+                    column_counts['source_changed'] += 1
+                if not column.targets[entry]:
+                    column_counts['empty'] += 1
+        return dict(zip(columns, counts))
@@ -0,0 +1,1533 @@
+"""The Qt GUI. Only main.py's __main__ block imports it, so CLI worker processes never load PyQt6."""
+import time
+import sys
+import json
+import os
+import bisect
+import cProfile
+import io
+import itertools
+import pstats
+import queue
+import threading
+
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                            QHBoxLayout, QLabel, QTextEdit, QPushButton, 
+                            QComboBox, QFileDialog, QMessageBox, QLineEdit,
+                            QProgressBar, QDialog, QTableView, QHeaderView,
+                            QAbstractItemView, QStyledItemDelegate, QSpinBox, QListWidget)
+from PyQt6.QtCore import (Qt, QThread, pyqtSignal, QDir, QAbstractTableModel,
+                          QModelIndex, QEvent, QRectF, QTimer)
+from PyQt6.QtGui import QColor, QPalette, QIcon, QPainter, QPen
+from translation_engine import (TranslationEngine, RequestScheduler, BatchControl, group_segments,
+                                reuse_translations, DEFAULT_WORKERS, DEFAULT_PACK_CHARS, PRIORITY_INTERACTIVE)
+from translation_memory import TranslationMemory, TRANSLATION_MEMORY_FILE
+from localization import (clean_html, unescape_key, load_flat_json, write_flat_json, load_supported_languages,
+                          save_supported_languages, SUPPORTED_LANGUAGES_FILE, SUPPORTED_LANGUAGES_CACHE)
+from search_index import SearchIndex
+from source_manifest import save_manifest, build_manifest
+from translation_store import TranslationStore, SOURCE_CHANGED
+from translation_backends import (make_translator_factory, supported_languages, backend_names, parse_chain,
+                                  DEFAULT_BACKEND, GLOSSARY_FILE)
+from translation_journal import TranslationJournal, load_journal, JOURNAL_FILE, JOURNAL_FLUSH_SECONDS
+from fuzzy_memory import FuzzyMemory
+from validation import language_files
+from translation_stats import RunStats, format_summary, format_status
+from autosave import Autosaver, load_snapshots, AUTOSAVE_DIR
+
+# Offered in the Backend box next to the registered backends
+BACKEND_CHAINS = ['glossary,google']
+SEARCH_DEBOUNCE_MS = 150
+SPINNER_INTERVAL_MS = 80
+# Translate All results are applied to the table at most once per frame...
+FRAME_INTERVAL_MS = 33
+RESULTS_PER_FRAME = 2000
+# ...and the worker blocks once this many are waiting for the GUI
+RESULT_QUEUE_SIZE = 10000
+STARTUP_LOG_FILE = 'startup_timing.jsonl'
+# Run summaries are appended here when TRANSLATOR_STATS_LOG is set
+STATS_LOG_FILE = 'translation_stats.jsonl'
+PROFILE_FILE = 'gui_profile.prof'
+STATS_INTERVAL_MS = 500
+# Unsaved edits are snapshotted once editing pauses, and at least this often while it goes on
+AUTOSAVE_DELAY_MS = 2000
+AUTOSAVE_MAX_DELAY_MS = 15000
+
+class StartupTimer:
+    """Records how long each startup phase took, measured from process start"""
+
+    def __init__(self, start):
+        self.start = start
+        self.last = start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def report(self):
+        report = {phase: round(seconds, 4) for phase, seconds in self.phases}
+        report['total'] = round(self.last - self.start, 4)
+        report['frozen'] = bool(getattr(sys, 'frozen', False))
+        return report
+
+    def summary(self):
+        return ", ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases)
+
+# Started again from process start by main() when launched through main.py
+startup_timer = StartupTimer(time.perf_counter())
+
+def get_application_path():
+    """Get the path to the application directory"""
+    if getattr(sys, 'frozen', False):
+        # If the application is run as a bundled executable
+        return os.path.dirname(sys.executable)
+    else:
+        # If the application is run from a Python script
+        return os.path.dirname(os.path.abspath(__file__))
+
+
+def resource_path(relative_path):
+    """Get absolute path to resource, works for dev and for PyInstaller"""
+    try:
+        # PyInstaller creates a temp folder and stores path in _MEIPASS
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = get_application_path()
+    return os.path.join(base_path, relative_path)
+
+class ExpandableTextDialog(QDialog):
+    def __init__(self, text, title="Text", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumSize(600, 400)
+        
+        layout = QVBoxLayout(self)
+        
+        # Text area
+        self.text_edit = QTextEdit()
+        self.text_edit.setText(clean_html(text))
+        self.text_edit.setReadOnly(True)
+        layout.addWidget(self.text_edit)
+        
+        # Close button
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+
+class EditableExpandableTextDialog(QDialog):
+    def __init__(self, text, title="Edit Text", parent=None, suggestions=()):
+        super().__init__(parent)
+        self.setWindowTitle(title)
+        self.setMinimumSize(600, 400)
+        
+        layout = QVBoxLayout(self)
+        
+        # Text area
+        self.text_edit = QTextEdit()
+        self.text_edit.setText(clean_html(text))
+        layout.addWidget(self.text_edit)
+        
+        # Similar strings translated before; clicking one copies its translation
+        self.suggestions = list(suggestions)
+        if self.suggestions:
+            best = self.suggestions[0]
+            if not text:
+                self.text_edit.setText(clean_html(best.target))
+                hint = f"Pre-filled from a {best.score:.0%} match. Similar translations:"
+            else:
+                hint = "Similar translations:"
+            layout.addWidget(QLabel(hint))
+            self.suggestion_list = QListWidget()
+            for suggestion in self.suggestions:
+                self.suggestion_list.addItem(
+                    f"{suggestion.score:.0%}  {truncate_text(clean_html(suggestion.source), 60)}  \u2192  "
+                    f"{truncate_text(clean_html(suggestion.target), 60)}")
+            self.suggestion_list.setMaximumHeight(90)
+            self.suggestion_list.itemClicked.connect(self.use_suggestion)
+            layout.addWidget(self.suggestion_list)
+        
+        # Buttons
+        btn_layout = QHBoxLayout()
+        
+        save_btn = QPushButton("Save")
+        save_btn.clicked.connect(self.accept)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        
+        btn_layout.addWidget(save_btn)
+        btn_layout.addWidget(cancel_btn)
+        layout.addLayout(btn_layout)
+    
+    def use_suggestion(self, item):
+        self.text_edit.setText(clean_html(self.suggestions[self.suggestion_list.row(item)].target))
+
+    def get_text(self):
+        return self.text_edit.toPlainText()
+
+class TranslationStatsDialog(QDialog):
+    """Live timings of the current or last Translate All run"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Translation Stats")
+        self.setMinimumSize(600, 400)
+        
+        layout = QVBoxLayout(self)
+        self.text_edit = QTextEdit()
+        self.text_edit.setReadOnly(True)
+        layout.addWidget(self.text_edit)
+        
+        button_layout = QHBoxLayout()
+        self.export_json_btn = QPushButton("Export JSON")
+        self.export_csv_btn = QPushButton("Export CSV")
+        # Profiles the GUI thread until clicked again
+        self.profile_btn = QPushButton("Profile GUI")
+        self.profile_btn.setCheckable(True)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.export_json_btn)
+        button_layout.addWidget(self.export_csv_btn)
+        button_layout.addWidget(self.profile_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        layout.addLayout(button_layout)
+
+    def show_text(self, text):
+        if text != self.text_edit.toPlainText():
+            self.text_edit.setPlainText(text)
+
+class LanguageListThread(QThread):
+    """Fetches the backend's supported language list off the GUI thread"""
+    languages_loaded = pyqtSignal(list)
+
+    def __init__(self, backend=DEFAULT_BACKEND, **options):
+        super().__init__()
+        self.backend = backend
+        self.options = options
+
+    def run(self):
+        try:
+            self.languages_loaded.emit(list(supported_languages(self.backend, **self.options)))
+        except Exception as e:
+            print(f"Could not refresh supported languages: {str(e)}")
+
+class TranslationThread(QThread):
+    """Runs Translate All; finished translations wait in self.results until the GUI takes them"""
+    progress = pyqtSignal(int)
+    results_ready = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, texts_to_translate, target_lang, workers=DEFAULT_WORKERS, translator_factory=None,
+                 memory=None, backend=DEFAULT_BACKEND, pack_chars=DEFAULT_PACK_CHARS, engine=None, scheduler=None,
+                 control=None, journal=None, fuzzy=None):
+        super().__init__()
+        self.texts_to_translate = texts_to_translate
+        self.target_lang = target_lang
+        self.workers = workers
+        self.memory = memory
+        self.backend = backend
+        self.pack_chars = pack_chars
+        self.translator_factory = translator_factory or make_translator_factory(backend, target_lang)
+        # A shared engine and scheduler keep their translators between runs
+        self.engine = engine
+        self.scheduler = scheduler
+        self.control = control or BatchControl()
+        # Completed translations are journaled so a crash does not lose them
+        self.journal = journal
+        # Near-exact matches of earlier translations skip the network
+        self.fuzzy = fuzzy
+        self.fuzzy_hits = 0
+        self.requests_saved = 0
+        self.stats = RunStats(len(texts_to_translate), target_lang, backend)
+        # Bounded so a GUI that falls behind slows the worker down instead of piling up results
+        self.results = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+        self.notified = False
+        self.percent = -1
+
+    def run(self):
+        engine = self.engine or TranslationEngine(self.translator_factory, workers=self.workers)
+        texts = {key: str(text) for key, text in self.texts_to_translate.items()}
+        total = len(texts)
+        done = 0
+        # Keys sharing a source text are translated once and fanned out
+        groups = group_segments(texts)
+        self.requests_saved = total - len(groups)
+        
+        # Serve whatever the translation memory or a near-identical earlier string already knows
+        for keys, translated, reused_from in reuse_translations(texts, groups, self.memory, self.target_lang,
+                                                                self.backend, self.fuzzy):
+            for key in keys:
+                self.deliver(key, translated)
+            done += len(keys)
+            if reused_from == 'fuzzy':
+                self.fuzzy_hits += len(keys)
+            self.stats.add_keys(len(keys), len(texts[keys[0]]) * len(keys), reused_from)
+        if done:
+            self.report_progress(done, total)
+        
+        new_translations = {}
+        for keys, translated, error in engine.translate_segments(texts, groups, self.pack_chars, self.scheduler,
+                                                                 control=self.control, stats=self.stats):
+            if error is None:
+                for key in keys:
+                    self.deliver(key, translated)
+                new_translations[texts[keys[0]]] = translated
+                self.stats.add_keys(len(keys), len(texts[keys[0]]) * len(keys))
+            else:
+                print(f"Error translating {', '.join(keys)}: {str(error)}")
+                self.stats.add_failed(keys, error)
+            done += len(keys)
+            self.report_progress(done, total)
+            if self.memory is not None and len(new_translations) >= 50:
+                self.memory.put_many(new_translations, self.target_lang, self.backend)
+                new_translations = {}
+        if self.memory is not None:
+            self.memory.put_many(new_translations, self.target_lang, self.backend)
+        if self.journal is not None:
+            self.journal.finish('cancelled' if self.control.cancelled else 'completed')
+        
+        self.stats.finish()
+        self.finished.emit()
+
+    def deliver(self, key, translated):
+        if self.journal is not None:
+            self.journal.record(key, translated)
+        self.results.put((key, translated))
+        # One signal until the GUI drains the queue, however many results arrive meanwhile
+        if not self.notified:
+            self.notified = True
+            self.results_ready.emit()
+
+    def take_results(self, limit):
+        """Called by the GUI: remove and return up to limit waiting (key, translation) pairs"""
+        self.notified = False
+        results = []
+        while len(results) < limit:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return results
+
+    def report_progress(self, done, total):
+        percent = int(done * 100 / total)
+        if percent != self.percent:
+            self.percent = percent
+            self.progress.emit(percent)
+
+def truncate_text(text, max_length=50):
+    return text if len(text) <= max_length else text[:max_length] + "..."
+
+class TranslationTableModel(QAbstractTableModel):
+    """Qt view of a TranslationStore; only entries in visible_rows are exposed to the view.
+
+    The Translation column shows the active language. Columns after the
+    Action column show the other registered languages side by side; their
+    files are parsed the first time one of their cells is needed.
+    """
+    KEY_COLUMN, SOURCE_COLUMN, TRANSLATION_COLUMN, ACTION_COLUMN = range(4)
+    FIRST_LANGUAGE_COLUMN = 4
+    # Language column whose translations were changed through the model
+    translations_edited = pyqtSignal(object)
+    # Language column whose file could not be parsed
+    load_failed = pyqtSignal(object)
+    HEADERS = [
+        "Key",
+        "Source Text (click to view)",
+        "Translation (click to edit)",
+        "Action"
+    ]
+    StatusRole = Qt.ItemDataRole.UserRole + 1
+    # Spinner phase for rows with a request in flight, None otherwise
+    PendingRole = Qt.ItemDataRole.UserRole + 2
+
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        # Cleaned source previews are only computed once a row is painted
+        self._source_previews = {}
+        self.visible_rows = list(range(len(store)))
+        self.side_columns = store.side_columns()
+        self.pending = set()
+        self.spinner_phase = 0
+        # Keys are shown and searched without the escapes of separators inside key names
+        self.search_index = SearchIndex([unescape_key(key) for key in store.keys], store.sources, store.targets)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.visible_rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.FIRST_LANGUAGE_COLUMN + len(self.side_columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            language = self.language_column(section)
+            if language is not None and language.error is not None:
+                return f"{language.name} (failed to load)"
+            if language is not None and language.path:
+                return f"{language.name} (click to edit)"
+            return self.HEADERS[section]
+        return None
+
+    def language_column(self, column):
+        """The LanguageColumn shown in a view column, or None for key/source/action"""
+        if column == self.TRANSLATION_COLUMN:
+            return self.store.active
+        if column >= self.FIRST_LANGUAGE_COLUMN:
+            return self.side_columns[column - self.FIRST_LANGUAGE_COLUMN]
+        return None
+
+    def ensure_loaded(self, language):
+        """Parse language's file if needed; one that fails to parse stays unloaded and read-only"""
+        if not language.loaded and language.error is None:
+            if not language.path:
+                self.store.load_targets({}, column=language)
+                return language
+            try:
+                self.store.load_columns([language])
+            except Exception as e:
+                print(f"Failed to load {language.path}: {str(e)}")
+                self.load_failed.emit(language)
+        return language
+
+    def columns_changed(self):
+        """Call after languages were added or the active one changed"""
+        self.beginResetModel()
+        self.side_columns = self.store.side_columns()
+        self.search_index.reset_targets(self.store.targets)
+        self.endResetModel()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.visible_rows[index.row()]
+        column = index.column()
+        store = self.store
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.KEY_COLUMN:
+                return unescape_key(store.keys[entry])
+            if column == self.SOURCE_COLUMN:
+                return self.source_preview(entry)
+            if column == self.TRANSLATION_COLUMN:
+                return store.targets[entry]
+            if column == self.ACTION_COLUMN:
+                return "Translate"
+        elif role == self.PendingRole and column == self.ACTION_COLUMN:
+            return self.spinner_phase if entry in self.pending else None
+        elif role == Qt.ItemDataRole.ToolTipRole and column == self.KEY_COLUMN:
+            return unescape_key(store.keys[entry])
+        elif role == self.StatusRole and column == self.SOURCE_COLUMN:
+            return bool(store.flags[entry])
+        elif role == Qt.ItemDataRole.ToolTipRole and column == self.SOURCE_COLUMN and store.has_flag(entry, SOURCE_CHANGED):
+            return "Source text changed since this was translated"
+
+        if column >= self.FIRST_LANGUAGE_COLUMN:
+            language = self.ensure_loaded(self.side_columns[column - self.FIRST_LANGUAGE_COLUMN])
+            if not language.loaded:
+                return None
+            if role == Qt.ItemDataRole.DisplayRole:
+                return language.targets[entry]
+            if role == self.StatusRole:
+                return bool(language.flags[entry]) or not language.targets[entry]
+        return None
+
+    def source_preview(self, entry):
+        preview = self._source_previews.get(entry)
+        if preview is None:
+            preview = truncate_text(clean_html(self.store.sources[entry]))
+            self._source_previews[entry] = preview
+        return preview
+
+    def entry_at(self, row):
+        return self.visible_rows[row]
+
+    def view_row(self, entry):
+        """Return the view row currently showing entry, or -1 if it is filtered out"""
+        pos = bisect.bisect_left(self.visible_rows, entry)
+        if pos < len(self.visible_rows) and self.visible_rows[pos] == entry:
+            return pos
+        return -1
+
+    def set_pending(self, entry, pending):
+        if pending:
+            self.pending.add(entry)
+        else:
+            self.pending.discard(entry)
+        self._emit_action_changed(entry)
+
+    def advance_spinner(self):
+        self.spinner_phase = (self.spinner_phase + 1) % 12
+        for entry in self.pending:
+            self._emit_action_changed(entry)
+
+    def _emit_action_changed(self, entry):
+        row = self.view_row(entry)
+        if row >= 0:
+            index = self.index(row, self.ACTION_COLUMN)
+            self.dataChanged.emit(index, index, [self.PendingRole])
+
+    def apply_translations(self, updates, language=None):
+        """Store many (entry, text) pairs and repaint the affected rows with a single signal"""
+        language = language or self.store.active
+        update_index = language is self.store.active
+        rows = []
+        for entry, text in updates:
+            self.store.set_target(entry, text, language)
+            if update_index:
+                self.search_index.update_target(entry, text)
+            row = self.view_row(entry)
+            if row >= 0:
+                rows.append(row)
+        if rows:
+            self.dataChanged.emit(self.index(min(rows), self.SOURCE_COLUMN),
+                                  self.index(max(rows), self.columnCount() - 1))
+        if updates:
+            self.translations_edited.emit(language)
+
+    def set_visible_rows(self, entries):
+        self.beginResetModel()
+        self.visible_rows = list(entries)
+        self.endResetModel()
+
+    def set_translation(self, entry, text, language=None):
+        language = language or self.store.active
+        self.store.set_target(entry, text, language)
+        if language is self.store.active:
+            self.search_index.update_target(entry, text)
+        row = self.view_row(entry)
+        if row >= 0:
+            self.dataChanged.emit(self.index(row, self.SOURCE_COLUMN),
+                                  self.index(row, self.columnCount() - 1))
+        self.translations_edited.emit(language)
+
+
+class StatusDelegate(QStyledItemDelegate):
+    """Paints cells whose StatusRole is set (missing, identical or stale) in the status colour"""
+    STATUS_COLOR = QColor("#4d1f1f")
+
+    def paint(self, painter, option, index):
+        if index.data(TranslationTableModel.StatusRole):
+            painter.fillRect(option.rect, self.STATUS_COLOR)
+        super().paint(painter, option, index)
+
+class TranslateButtonDelegate(QStyledItemDelegate):
+    """Paints a Translate button in each row, or a spinner while its request runs, and reports clicks by view row"""
+    clicked = pyqtSignal(int)
+    BUTTON_COLOR = QColor("#007acc")
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        phase = index.data(TranslationTableModel.PendingRole)
+        if phase is not None:
+            size = min(option.rect.height() - 14, 20)
+            rect = QRectF(option.rect.center().x() - size / 2, option.rect.center().y() - size / 2, size, size)
+            painter.setPen(QPen(self.BUTTON_COLOR, 3))
+            # Angles are in 1/16th of a degree
+            painter.drawArc(rect, -phase * 30 * 16, 270 * 16)
+            painter.restore()
+            return
+        rect = option.rect.adjusted(6, 4, -6, -4)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self.BUTTON_COLOR)
+        painter.drawRoundedRect(QRectF(rect), 4, 4)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, index.data())
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease
+                and event.button() == Qt.MouseButton.LeftButton
+                and index.data(TranslationTableModel.PendingRole) is None):
+            self.clicked.emit(index.row())
+            return True
+        return False
+
+class TranslatorApp(QMainWindow):
+    # (language column, entry, translation or None, error message) from a worker thread
+    row_translated = pyqtSignal(object, int, object, str)
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Seamless Co-op Mod Manager Translator")
+        self.setMinimumSize(1200, 800)
+        
+        # Set application icon
+        icon_path = resource_path(os.path.join('assets', 'languages.ico'))  # Use the .ico file
+        self.setWindowIcon(QIcon(icon_path))
+
+        
+        # Load reference English JSON
+        try:
+            json_path = os.path.join(get_application_path(), 'en.json')
+            self.all_keys = load_flat_json(json_path)
+            startup_timer.mark("en.json parse")
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load en.json: {str(e)}\nPath: {json_path}")
+            sys.exit(1)
+        
+        self.store = TranslationStore(self.all_keys)
+        self.model = TranslationTableModel(self.store, self)
+        
+        # Translation memory cache stored next to en.json
+        try:
+            self.translation_memory = TranslationMemory(
+                os.path.join(get_application_path(), TRANSLATION_MEMORY_FILE))
+        except Exception as e:
+            print(f"Translation memory disabled: {str(e)}")
+            self.translation_memory = None
+        
+        # One scheduler serves single rows and Translate All; its workers start on first use
+        self.scheduler = RequestScheduler(DEFAULT_WORKERS)
+        self.engines = {}
+        # Column -> (target language, FuzzyMemory) of translations to suggest from
+        self.fuzzy_memories = {}
+        self.row_translated.connect(self.row_translation_done)
+        self.translation_thread = None
+        self.delivery_timer = QTimer(self)
+        self.delivery_timer.setSingleShot(True)
+        self.delivery_timer.timeout.connect(self.apply_results)
+        self.last_delivery = 0.0
+        # Unsaved Translate All results, kept until the columns they went to are saved
+        self.journal = TranslationJournal(os.path.join(get_application_path(), JOURNAL_FILE))
+        # {column: {entry: text}} the journal holds; autosave leaves those to it
+        self.journal_columns = {}
+        # record() only flushes when results arrive; this covers a run that paused or stalled
+        self.journal_timer = QTimer(self)
+        self.journal_timer.setInterval(int(JOURNAL_FLUSH_SECONDS * 1000))
+        self.journal_timer.timeout.connect(self.journal.flush)
+        self.spinner_timer = QTimer(self)
+        self.spinner_timer.setInterval(SPINNER_INTERVAL_MS)
+        self.spinner_timer.timeout.connect(self.model.advance_spinner)
+        # Stats of the running or last Translate All run, shown in the status bar and stats panel
+        self.stats = None
+        self.stats_dialog = None
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(STATS_INTERVAL_MS)
+        self.stats_timer.timeout.connect(self.refresh_stats)
+        self.profiler = None
+        self.profile_report = ""
+        # Edits not saved yet are snapshotted in the background so a crash does not lose them
+        self.autosaver = Autosaver(os.path.join(get_application_path(), AUTOSAVE_DIR))
+        self.autosave_columns = set()
+        self.autosave_since = 0.0
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setSingleShot(True)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.model.translations_edited.connect(self.schedule_autosave)
+        # Queued, so the message box never opens while the table is painting
+        self.model.load_failed.connect(self.show_load_error, Qt.ConnectionType.QueuedConnection)
+        
+        self.init_ui()
+        startup_timer.mark("UI build")
+        
+        # Build the search index in the background once the window is up
+        QTimer.singleShot(0, lambda: threading.Thread(target=self.model.search_index.warm, daemon=True).start())
+        
+        # Load external stylesheet
+        try:
+            style_path = resource_path('dark_style.qss')
+            if not os.path.exists(style_path):
+                QMessageBox.warning(self, "Warning", f"Could not find stylesheet at: {style_path}")
+            else:
+                with open(style_path, 'r', encoding='utf-8') as f:
+                    stylesheet = f.read()
+                    self.setStyleSheet(stylesheet)
+                    # Apply stylesheet to the application
+                    QApplication.instance().setStyleSheet(stylesheet)
+        except Exception as e:
+            QMessageBox.warning(self, "Warning", f"Error loading stylesheet: {str(e)}\nPath: {style_path}")
+        startup_timer.mark("stylesheet")
+
+    def init_ui(self):
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        main_layout = QVBoxLayout(central_widget)
+        main_layout.setSpacing(10)
+        
+        # Top controls
+        controls_layout = QVBoxLayout()
+        controls_layout.setSpacing(10)
+        
+        # Search controls; filtering waits until typing pauses
+        search_layout = QHBoxLayout()
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.apply_search_filters)
+        
+        # Key search
+        key_search_label = QLabel("Search Key:")
+        self.key_search = QLineEdit()
+        self.key_search.setPlaceholderText("Search by key...")
+        self.key_search.textChanged.connect(self.search_timer.start)
+        search_layout.addWidget(key_search_label)
+        search_layout.addWidget(self.key_search)
+        
+        # Source text search
+        source_search_label = QLabel("Search Source:")
+        self.source_search = QLineEdit()
+        self.source_search.setPlaceholderText("Search in source text...")
+        self.source_search.textChanged.connect(self.search_timer.start)
+        search_layout.addWidget(source_search_label)
+        search_layout.addWidget(self.source_search)
+        
+        
+        # Target text search
+        target_search_label = QLabel("Search Translation:")
+        self.target_search = QLineEdit()
+        self.target_search.setPlaceholderText("Search in translations...")
+        self.target_search.textChanged.connect(self.search_timer.start)
+        search_layout.addWidget(target_search_label)
+        search_layout.addWidget(self.target_search)
+        
+        controls_layout.addLayout(search_layout)
+        
+        # Language selection
+        lang_layout = QHBoxLayout()
+        lang_label = QLabel("Target Language:")
+        self.lang_combo = QComboBox()
+        self.lang_search = QLineEdit()
+        self.lang_search.setPlaceholderText("Search language...")
+        self.lang_search.textChanged.connect(self.filter_languages)
+        
+        # Start from the cached (or bundled) language list; refreshed once the window is up
+        self.available_langs = load_supported_languages(
+            os.path.join(get_application_path(), SUPPORTED_LANGUAGES_CACHE),
+            resource_path(os.path.join('assets', SUPPORTED_LANGUAGES_FILE))
+        )
+        self.lang_combo.addItems(self.available_langs)
+        
+        # Number of concurrent requests used by Translate All
+        workers_label = QLabel("Parallel Requests:")
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 32)
+        self.workers_spin.setValue(DEFAULT_WORKERS)
+        self.workers_spin.valueChanged.connect(self.scheduler.set_workers)
+        
+        lang_layout.addWidget(lang_label)
+        lang_layout.addWidget(self.lang_search)
+        lang_layout.addWidget(self.lang_combo)
+        lang_layout.addWidget(workers_label)
+        lang_layout.addWidget(self.workers_spin)
+        controls_layout.addLayout(lang_layout)
+        
+        # Translation backend, or a comma separated fallback chain, and an optional hedge backend
+        backend_layout = QHBoxLayout()
+        backend_label = QLabel("Backend:")
+        self.backend_combo = QComboBox()
+        self.backend_combo.setEditable(True)
+        self.backend_combo.addItems(backend_names() + BACKEND_CHAINS)
+        self.backend_combo.setCurrentText(DEFAULT_BACKEND)
+        self.backend_combo.activated.connect(lambda _: self.refresh_languages())
+        self.backend_combo.setToolTip("A backend name or a fallback chain such as glossary,google; "
+                                      f"glossary reads {GLOSSARY_FILE} next to en.json")
+        hedge_label = QLabel("Hedge Slow Requests With:")
+        self.hedge_combo = QComboBox()
+        self.hedge_combo.addItems(["(off)"] + backend_names())
+        self.hedge_combo.setToolTip("Race this backend against requests slower than 95% of recent ones")
+        
+        backend_layout.addWidget(backend_label)
+        backend_layout.addWidget(self.backend_combo, 1)
+        backend_layout.addWidget(hedge_label)
+        backend_layout.addWidget(self.hedge_combo)
+        controls_layout.addLayout(backend_layout)
+        
+        # Language files shown side by side; the selected one is edited and translated
+        files_layout = QHBoxLayout()
+        files_label = QLabel("Editing:")
+        self.file_combo = QComboBox()
+        self.file_combo.setMinimumWidth(200)
+        self.file_combo.activated.connect(self.set_active_column)
+        self.open_folder_btn = QPushButton("Open Localization Folder")
+        self.open_folder_btn.clicked.connect(self.open_localization_folder)
+        self.save_all_btn = QPushButton("Save All Languages")
+        self.save_all_btn.clicked.connect(self.save_all_languages)
+
+        files_layout.addWidget(files_label)
+        files_layout.addWidget(self.file_combo, 1)
+        files_layout.addWidget(self.open_folder_btn)
+        files_layout.addWidget(self.save_all_btn)
+        controls_layout.addLayout(files_layout)
+        self.refresh_file_combo()
+
+        # File and translation controls
+        btn_layout = QHBoxLayout()
+        self.load_file_btn = QPushButton("Load Target Translation")
+        self.translate_all_btn = QPushButton("Translate All")
+        self.save_btn = QPushButton("Save Translation")
+        
+        self.load_file_btn.clicked.connect(self.load_translation_file)
+        self.translate_all_btn.clicked.connect(self.translate_all)
+        self.save_btn.clicked.connect(self.save_translation)
+        
+        # Only shown while Translate All runs
+        self.pause_btn = QPushButton("Pause")
+        self.cancel_btn = QPushButton("Cancel")
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        self.cancel_btn.clicked.connect(self.cancel_translation)
+        self.pause_btn.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        
+        btn_layout.addWidget(self.load_file_btn)
+        btn_layout.addWidget(self.translate_all_btn)
+        btn_layout.addWidget(self.pause_btn)
+        btn_layout.addWidget(self.cancel_btn)
+        btn_layout.addWidget(self.save_btn)
+        controls_layout.addLayout(btn_layout)
+
+        self.missing_translations_btn = QPushButton("Show Missing Translations")
+        self.missing_translations_btn.clicked.connect(self.show_missing_translations)
+        btn_layout.addWidget(self.missing_translations_btn)
+        self.stats_btn = QPushButton("Stats")
+        self.stats_btn.clicked.connect(self.show_stats)
+        btn_layout.addWidget(self.stats_btn)
+        
+        # Progress bar
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+        controls_layout.addWidget(self.progress_bar)
+        
+        main_layout.addLayout(controls_layout)
+        
+        # Translations table; only the visible rows are ever painted
+        self.table_view = QTableView()
+        self.table_view.setModel(self.model)
+        self.table_view.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.table_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table_view.setWordWrap(False)
+        self.table_view.setShowGrid(False)
+        self.table_view.verticalHeader().setVisible(False)
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table_view.verticalHeader().setDefaultSectionSize(36)
+
+        header = self.table_view.horizontalHeader()
+        header.setSectionResizeMode(TranslationTableModel.KEY_COLUMN, QHeaderView.ResizeMode.Interactive)
+        header.setSectionResizeMode(TranslationTableModel.SOURCE_COLUMN, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(TranslationTableModel.TRANSLATION_COLUMN, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(TranslationTableModel.ACTION_COLUMN, QHeaderView.ResizeMode.Fixed)
+        self.table_view.setColumnWidth(TranslationTableModel.KEY_COLUMN, 200)
+        self.table_view.setColumnWidth(TranslationTableModel.ACTION_COLUMN, 100)
+        header.setDefaultSectionSize(220)
+
+        # Highlights stale cells in the source column and in every side language column
+        self.status_delegate = StatusDelegate(self.table_view)
+        self.table_view.setItemDelegate(self.status_delegate)
+        self.translate_delegate = TranslateButtonDelegate(self.table_view)
+        self.translate_delegate.clicked.connect(self.translate_row)
+        self.table_view.setItemDelegateForColumn(TranslationTableModel.ACTION_COLUMN, self.translate_delegate)
+
+        self.table_view.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.table_view.clicked.connect(self.on_cell_clicked)
+        main_layout.addWidget(self.table_view)
+        
+        # Status
+        self.status_label = QLabel("Ready")
+        main_layout.addWidget(self.status_label)
+
+    def on_cell_clicked(self, index):
+        entry = self.model.entry_at(index.row())
+        language = self.model.language_column(index.column())
+        if index.column() == TranslationTableModel.SOURCE_COLUMN:
+            self.show_source_dialog(entry)
+        elif language is not None:
+            self.show_translation_dialog(entry, language)
+
+    def show_source_dialog(self, entry):
+        source_text = self.store.sources[entry]
+        dialog = ExpandableTextDialog(source_text, f"Source Text - {unescape_key(self.store.keys[entry])}", self)
+        dialog.text_edit.setHtml(clean_html(source_text, preserve_html=True))
+        dialog.exec()
+
+    def show_translation_dialog(self, entry, language=None):
+        language = self.model.ensure_loaded(language or self.store.active)
+        if not language.loaded:
+            self.show_load_error(language)
+            return
+        source, current = self.store.sources[entry], language.targets[entry]
+        suggestions = [suggestion for suggestion in self.fuzzy_memory(language).suggest(source)
+                       if suggestion.source != source or suggestion.target != current]
+        title = f"{language.name} - {unescape_key(self.store.keys[entry])}"
+        dialog = EditableExpandableTextDialog(current, title, self, suggestions)
+        if dialog.exec() == QDialog.DialogCode.Accepted:
+            text = dialog.get_text()
+            self.model.set_translation(entry, text, language)
+            self.remember(language, [(entry, text)])
+
+    def fuzzy_memory(self, column, target_lang=None):
+        """Similarity index over column's translations, built in the background on first use.
+
+        The translation memory of target_lang and the selected backend is
+        included; target_lang defaults to the selected language for the active
+        column and the memory is skipped for the others.
+        """
+        if target_lang is None and column is self.store.active:
+            target_lang = self.lang_combo.currentText()
+        backend = self.backend_combo.currentText()
+        cached = self.fuzzy_memories.get(column)
+        if cached is not None and cached[0] == (target_lang, backend):
+            return cached[1]
+        store = self.store
+        pairs = [(source, target) for source, target, status in zip(store.sources, column.targets, column.flags)
+                 if target and not status]
+        memory = self.translation_memory if target_lang else None
+        fuzzy = FuzzyMemory()
+
+        def build():
+            # load() must still run and mark the index ready, or Translate All would wait on it forever
+            try:
+                remembered = memory.pairs(target_lang, backend) if memory else ()
+            except Exception as e:
+                print(f"Could not read the translation memory: {str(e)}")
+                remembered = ()
+            fuzzy.load(itertools.chain(pairs, remembered))
+
+        threading.Thread(target=build, daemon=True).start()
+        self.fuzzy_memories[column] = ((target_lang, backend), fuzzy)
+        return fuzzy
+
+    def remember(self, column, updates):
+        """Make new (entry, translation) pairs of column available as suggestions"""
+        cached = self.fuzzy_memories.get(column)
+        if cached is not None:
+            sources = self.store.sources
+            cached[1].add_many((sources[entry], text) for entry, text in updates)
+
+    def backend_spec(self):
+        """The selected backend (chain); raises ValueError for unknown names"""
+        spec = self.backend_combo.currentText()
+        parse_chain(spec)
+        return spec
+
+    def hedge_spec(self):
+        return self.hedge_combo.currentText() if self.hedge_combo.currentIndex() > 0 else None
+
+    def backend_options(self):
+        return {'glossary_path': os.path.join(get_application_path(), GLOSSARY_FILE)}
+
+    def engine_for(self, target_lang):
+        """Shared engine per backend and target language; the scheduler's workers reuse its translators"""
+        key = (self.backend_spec(), self.hedge_spec(), target_lang)
+        engine = self.engines.get(key)
+        if engine is None:
+            engine = TranslationEngine(make_translator_factory(key[0], target_lang, key[1],
+                                                               **self.backend_options()))
+            self.engines[key] = engine
+        return engine
+
+    def translate_row(self, row):
+        entry = self.model.entry_at(row)
+        if entry in self.model.pending:
+            return
+        column = self.store.active
+        target_lang = self.lang_combo.currentText()
+        try:
+            engine = self.engine_for(target_lang)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        backend = self.backend_spec()
+        clean_text = clean_html(self.store.sources[entry])
+        memory = self.translation_memory
+        translated = memory.get(clean_text, target_lang, backend) if memory else None
+        if translated is None:
+            match = self.fuzzy_memory(column, target_lang).near_exact(clean_text)
+            translated = match.target if match is not None else None
+        if translated is not None:
+            self.model.set_translation(entry, translated, column)
+            return
+
+        def deliver(results):
+            _, translated, error = results[0]
+            if error is None and memory:
+                memory.put(clean_text, target_lang, backend, translated)
+            self.row_translated.emit(column, entry, translated, str(error) if error else "")
+
+        # Jumps ahead of any queued Translate All requests
+        self.scheduler.submit(engine, [entry], {entry: clean_text}, deliver,
+                              PRIORITY_INTERACTIVE)
+        self.model.set_pending(entry, True)
+        self.spinner_timer.start()
+
+    def row_translation_done(self, column, entry, translated, error):
+        self.model.set_pending(entry, False)
+        if not self.model.pending:
+            self.spinner_timer.stop()
+        if error:
+            QMessageBox.critical(self, "Error", f"Translation failed: {error}")
+        elif column in self.store.columns:
+            self.model.set_translation(entry, translated, column)
+            self.remember(column, [(entry, translated)])
+
+    def show_missing_translations(self):
+        # Consider a translation missing or needing translation if:
+        # 1. No translation text, or
+        # 2. Explicitly marked as missing translation, or
+        # 3. Source and translation are the same (needs translation), or
+        # 4. The en.json text changed since it was translated
+        # With several languages open, a row is shown if any of them needs work
+        store = self.store
+        pending = [column for column in store.columns if not column.loaded and column.path and column.error is None]
+        while pending:
+            try:
+                store.load_columns(pending)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
+                if not any(column.error is not None for column in pending):
+                    return
+                self.model.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.model.columnCount() - 1)
+            # Files that failed are skipped, the others still count
+            pending = [column for column in pending if not column.loaded and column.error is None]
+        columns = store.loaded_columns()
+        missing = store.stale_entries(columns)
+        self.model.set_visible_rows(missing)
+
+        status = f"Showing {len(missing)} missing/needs translation out of {len(store)} items"
+        if len(columns) > 1:
+            per_language = [f"{column.name}: {len(store.stale_entries([column]))}" for column in columns]
+            status += f" ({', '.join(per_language)})"
+        self.status_label.setText(status)
+    
+    def apply_search_filters(self):
+        """Apply search filters to choose which rows the table shows"""
+        self.search_timer.stop()
+        model = self.model
+        visible = model.search_index.search(
+            self.key_search.text(),
+            self.source_search.text(),
+            self.target_search.text()
+        )
+        model.set_visible_rows(visible)
+        
+        self.status_label.setText(f"Showing {len(visible)} of {len(self.store)} items")
+    
+    def refresh_languages(self):
+        try:
+            backend = self.backend_spec()
+        except ValueError:
+            backend = DEFAULT_BACKEND
+        self.language_thread = LanguageListThread(backend, **self.backend_options())
+        self.language_thread.languages_loaded.connect(self.update_languages)
+        self.language_thread.start()
+
+    def update_languages(self, languages):
+        if not languages or languages == self.available_langs:
+            return
+        current = self.lang_combo.currentText()
+        self.available_langs = languages
+        self.filter_languages(self.lang_search.text())
+        if current in languages:
+            self.lang_combo.setCurrentText(current)
+        try:
+            save_supported_languages(os.path.join(get_application_path(), SUPPORTED_LANGUAGES_CACHE), languages)
+        except Exception as e:
+            print(f"Could not cache supported languages: {str(e)}")
+
+    def on_first_paint(self):
+        startup_timer.mark("first paint")
+        self.status_label.setText(f"Ready (started in {startup_timer.report()['total']:.2f}s)")
+        if os.environ.get('TRANSLATOR_STARTUP_TIMING'):
+            report = startup_timer.report()
+            print(f"Startup: {startup_timer.summary()}", file=sys.stderr)
+            try:
+                with open(os.path.join(get_application_path(), STARTUP_LOG_FILE), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(report) + "\n")
+            except Exception as e:
+                print(f"Could not write startup timing: {str(e)}", file=sys.stderr)
+        self.refresh_languages()
+        self.offer_resume()
+        self.offer_restore()
+
+    def offer_resume(self):
+        """Offer to restore Translate All results left in the journal by an earlier session"""
+        runs = [run for run in load_journal(self.journal.path)
+                if run.done or (not run.finished and run.remaining())]
+        if not runs:
+            self.journal.discard()
+            return
+        last = runs[-1]
+        message = (f"{sum(len(run.done) for run in runs)} unsaved translations from an earlier "
+                   f"Translate All were recovered.")
+        if not last.finished and last.remaining():
+            message += f" {len(last.remaining())} keys for {last.column} were not translated yet."
+        reply = QMessageBox.question(self, "Resume Translation", message + "\n\nRestore and resume?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            self.journal.discard()
+            return
+        try:
+            self.resume_journal(runs)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to restore translations: {str(e)}")
+
+    def resume_journal(self, runs):
+        store = self.store
+        column = None
+        for run in runs:
+            column = self._column_for(run.column, run.path)
+            journaled = self.journal_columns.setdefault(column, {})
+            for key, text in run.done.items():
+                entry = store.index.get(key)
+                if entry is not None:
+                    store.set_target(entry, text, column)
+                    journaled[entry] = text
+            self.schedule_autosave(column)
+        store.active = column
+        self._drop_pristine_default()
+        self.model.columns_changed()
+        self.refresh_file_combo()
+        self.apply_search_filters()
+
+        last = runs[-1]
+        remaining = {key: store.sources[store.index[key]] for key in last.remaining()
+                     if key in store.index and not column.targets[store.index[key]]}
+        if last.finished or not remaining:
+            self.status_label.setText(f"Restored {sum(len(run.done) for run in runs)} unsaved translations")
+            return
+        if last.lang in self.available_langs:
+            self.lang_search.clear()
+            self.lang_combo.setCurrentText(last.lang)
+        self.start_translation(remaining, last.lang, column)
+
+    def _column_for(self, name, path):
+        """Loaded column of the file at path, or the unsaved column if path is None, added if missing"""
+        store = self.store
+        if path:
+            column = store.column_for_path(path) or store.add_column(name, path)
+        else:
+            column = next((column for column in store.columns if column.path is None), None)
+            column = column or store.add_column(name)
+        column = self.model.ensure_loaded(column)
+        if not column.loaded:
+            raise ValueError(f"Failed to load {column.path}: {column.error}")
+        return column
+
+    def offer_restore(self):
+        """Offer to restore edits autosaved by an earlier session and never saved"""
+        snapshots = []
+        for snapshot in load_snapshots(self.autosaver.folder):
+            path = snapshot.get('path')
+            # Saved since, e.g. from another copy of the tool
+            outdated = path and os.path.exists(path) and os.path.getmtime(path) > snapshot.get('time', 0)
+            if not snapshot.get('edits') or outdated:
+                self.autosaver.discard(snapshot.get('name', ''), path)
+            else:
+                snapshots.append(snapshot)
+        if not snapshots:
+            return
+        count = sum(len(snapshot['edits']) for snapshot in snapshots)
+        names = ", ".join(snapshot['name'] for snapshot in snapshots)
+        reply = QMessageBox.question(self, "Restore Unsaved Edits",
+                                     f"{count} unsaved edits to {names} were autosaved by an earlier session."
+                                     f"\n\nRestore them?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply != QMessageBox.StandardButton.Yes:
+            for snapshot in snapshots:
+                self.autosaver.discard(snapshot['name'], snapshot.get('path'))
+            return
+        store = self.store
+        column = None
+        try:
+            for snapshot in snapshots:
+                column = self._column_for(snapshot['name'], snapshot.get('path'))
+                self.model.apply_translations([(store.index[key], text) for key, text in snapshot['edits'].items()
+                                               if key in store.index], column)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to restore edits: {str(e)}")
+            return
+        store.active = column
+        self._drop_pristine_default()
+        self.model.columns_changed()
+        self.refresh_file_combo()
+        self.apply_search_filters()
+        self.status_label.setText(f"Restored {count} autosaved edits")
+
+    def schedule_autosave(self, column):
+        """Snapshot column once edits pause for a moment, but no later than AUTOSAVE_MAX_DELAY_MS"""
+        self.autosave_columns.add(column)
+        now = time.perf_counter()
+        if not self.autosave_timer.isActive():
+            self.autosave_since = now
+        remaining_ms = AUTOSAVE_MAX_DELAY_MS - (now - self.autosave_since) * 1000
+        self.autosave_timer.start(int(max(0, min(AUTOSAVE_DELAY_MS, remaining_ms))))
+
+    def autosave(self):
+        """Hand the unsaved edits of recently edited columns to the background writer"""
+        self.autosave_timer.stop()
+        columns, self.autosave_columns = self.autosave_columns, set()
+        for column in columns:
+            if column in self.store.columns and column.edited:
+                # Translate All results are in the journal; only edits made since need a snapshot
+                journaled = self.journal_columns.get(column, {})
+                edits = {self.store.keys[entry]: column.targets[entry] for entry in column.edited
+                         if journaled.get(entry) != column.targets[entry]}
+                if edits:
+                    self.autosaver.submit(column.name, column.path, edits)
+                else:
+                    self.autosaver.discard(column.name, column.path)
+
+    def closeEvent(self, event):
+        # Whatever is still unsaved is offered again on the next launch
+        self.autosave()
+        self.autosaver.flush()
+        super().closeEvent(event)
+
+    def filter_languages(self, text):
+        self.lang_combo.clear()
+        filtered_langs = [lang for lang in self.available_langs if text.lower() in lang.lower()]
+        self.lang_combo.addItems(filtered_langs)
+    
+    def refresh_file_combo(self):
+        self.file_combo.clear()
+        for column in self.store.columns:
+            self.file_combo.addItem(column.name)
+        self.file_combo.setCurrentIndex(self.store.columns.index(self.store.active))
+
+    def _drop_pristine_default(self):
+        """Forget the unsaved default column once real language files are open"""
+        store = self.store
+        default = store.columns[0]
+        if default.path is None and not default.dirty and default is not store.active and len(store.columns) > 1:
+            store.columns.remove(default)
+
+    def set_active_column(self, position):
+        column = self.store.columns[position]
+        if column is self.store.active:
+            return
+        try:
+            self.store.set_active(column)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
+            self.refresh_file_combo()
+            return
+        self._drop_pristine_default()
+        self.model.columns_changed()
+        self.refresh_file_combo()
+        self.apply_search_filters()
+
+    def open_localization_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Localization Folder")
+        if folder:
+            self.open_language_files(folder)
+
+    def open_language_files(self, folder):
+        """Register every target file in folder as a column; files are parsed when first shown"""
+        store = self.store
+        added = []
+        for path in language_files(folder):
+            if store.column_for_path(path) is None:
+                added.append(store.add_column(os.path.splitext(os.path.basename(path))[0], path))
+        if not added:
+            self.status_label.setText(f"No new language files in {folder}")
+            return
+        if store.active.path is None and not store.active.dirty:
+            try:
+                store.set_active(added[0])
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
+        self._drop_pristine_default()
+        self.model.columns_changed()
+        self.refresh_file_combo()
+        self.apply_search_filters()
+        self.status_label.setText(f"Opened {len(added)} language files from {folder}")
+
+    def save_all_languages(self):
+        store = self.store
+        sources = None
+        saved = []
+        for column in store.loaded_columns():
+            if not column.dirty or not column.path:
+                continue
+            if sources is None:
+                sources = store.source_map()
+            try:
+                self._save_column(column, column.path, sources)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save {column.path}: {str(e)}")
+                return
+            saved.append(column.name)
+        self.status_label.setText(f"Saved {', '.join(saved)}" if saved else "No unsaved changes")
+
+    def _save_column(self, column, file_name, sources):
+        """Write column to file_name; returns False if that was a copy and column's own file is still unsaved"""
+        if not column.loaded:
+            # Writing it would replace the file with whatever little was edited
+            raise ValueError(f"{column.name} was never loaded"
+                             + (f" ({column.error})" if column.error is not None else ""))
+        translations = self.store.translations(column)
+        # Streamed to a temporary file and swapped in, so a crash never truncates it
+        write_flat_json(file_name, translations)
+        manifest = build_manifest(sources, translations, column.manifest, self.store.stale_keys(column))
+        save_manifest(file_name, manifest)
+        if column.path is not None and os.path.abspath(file_name) != os.path.abspath(column.path):
+            # Only a copy: the column's own file still lacks the edits
+            return False
+        column.manifest = manifest
+        self.store.mark_saved(column)
+        self.autosave_columns.discard(column)
+        self.autosaver.discard(column.name, column.path)
+        # The journal is only needed until every language it touched is saved
+        self.journal_columns.pop(column, None)
+        running = self.translation_thread is not None and self.translation_thread.isRunning()
+        if not self.journal_columns and not running:
+            self.journal.discard()
+        return True
+
+    def show_load_error(self, column):
+        self.model.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.model.columnCount() - 1)
+        self.status_label.setText(f"Failed to load {column.path}")
+        QMessageBox.critical(self, "Error", f"Failed to load {column.path}: {column.error}\n\n"
+                             f"The {column.name} column is read-only and will not be saved.")
+
+    def load_translation_file(self):
+        file_name, _ = QFileDialog.getOpenFileName(self, "Select Translation File", "", "JSON files (*.json)")
+        if file_name:
+            try:
+                store = self.store
+                column = store.column_for_path(file_name)
+                if column is None:
+                    column = store.add_column(os.path.splitext(os.path.basename(file_name))[0], file_name)
+                # Update translations and status flags
+                diff = store.load_columns([column])[column]
+                self.fuzzy_memories.pop(column, None)
+                store.active = column
+                self._drop_pristine_default()
+                self.model.columns_changed()
+                self.refresh_file_combo()
+                
+                self.apply_search_filters()  # Reapply search filters after loading
+                counts = store.status_counts()[column]
+                self.status_label.setText(
+                    f"Loaded translation file: {file_name} ({len(diff.new)} new, "
+                    f"{len(diff.source_changed)} source changed, {len(diff.removed)} removed, "
+                    f"{len(diff.unchanged)} unchanged, {counts['identical']} identical to source)")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load file: {str(e)}")
+
+    def translate_all(self):
+        target_lang = self.lang_combo.currentText()
+        
+        # Prepare texts to translate
+        store = self.store
+        texts_to_translate = {
+            store.keys[entry]: store.sources[entry]
+            for entry in self.model.visible_rows
+            # Only translate visible fields that are empty or whose source changed
+            if not store.targets[entry] or store.has_flag(entry, SOURCE_CHANGED)
+        }
+        self.start_translation(texts_to_translate, target_lang, store.active)
+
+    def start_translation(self, texts_to_translate, target_lang, column):
+        try:
+            engine = self.engine_for(target_lang)
+        except ValueError as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+        # Results keep going to this language even if another one is selected meanwhile
+        self.translation_column = column
+        self.journal.start(target_lang, column.name, column.path, texts_to_translate)
+        self.journal_columns.setdefault(column, {})
+        
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.translate_all_btn.setEnabled(False)
+        self.pause_btn.setText("Pause")
+        self.pause_btn.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        
+        # Create and start translation thread
+        self.translation_thread = TranslationThread(texts_to_translate, target_lang, self.workers_spin.value(),
+                                                    memory=self.translation_memory,
+                                                    backend=self.backend_spec(),
+                                                    engine=engine,
+                                                    scheduler=self.scheduler,
+                                                    journal=self.journal,
+                                                    fuzzy=self.fuzzy_memory(column, target_lang))
+        self.translation_thread.progress.connect(self.update_progress)
+        self.translation_thread.results_ready.connect(self.schedule_results)
+        self.translation_thread.finished.connect(self.translation_finished)
+        self.stats = self.translation_thread.stats
+        self.stats_timer.start()
+        self.journal_timer.start()
+        self.translation_thread.start()
+    
+    def toggle_pause(self):
+        control = self.translation_thread.control
+        if control.paused:
+            control.resume()
+            self.pause_btn.setText("Pause")
+            self.status_label.setText("Translating...")
+        else:
+            control.pause()
+            self.journal.flush()
+            self.pause_btn.setText("Resume")
+            self.status_label.setText("Translation paused; requests already sent will still arrive")
+
+    def cancel_translation(self):
+        self.translation_thread.control.cancel()
+        self.pause_btn.setVisible(False)
+        self.cancel_btn.setEnabled(False)
+    
+    def update_progress(self, value):
+        self.progress_bar.setValue(value)
+    
+    def schedule_results(self):
+        """Apply waiting results on the next frame boundary rather than once per key"""
+        if not self.delivery_timer.isActive():
+            elapsed_ms = (time.perf_counter() - self.last_delivery) * 1000
+            self.delivery_timer.start(int(max(0, FRAME_INTERVAL_MS - elapsed_ms)))
+
+    def apply_results(self):
+        self.last_delivery = time.perf_counter()
+        thread = self.translation_thread
+        results = thread.take_results(RESULTS_PER_FRAME)
+        if results:
+            index = self.store.index
+            updates = [(index[key], text) for key, text in results if key in index]
+            # One repaint for the whole batch
+            self.table_view.setUpdatesEnabled(False)
+            try:
+                self.model.apply_translations(updates, self.translation_column)
+            finally:
+                self.table_view.setUpdatesEnabled(True)
+            self.remember(self.translation_column, updates)
+            self.journal_columns.setdefault(self.translation_column, {}).update(updates)
+            thread.stats.record_ui(time.perf_counter() - self.last_delivery)
+        if not thread.results.empty():
+            self.schedule_results()
+    
+    def translation_finished(self):
+        self.delivery_timer.stop()
+        self.journal_timer.stop()
+        while not self.translation_thread.results.empty():
+            self.apply_results()
+        self.delivery_timer.stop()
+        self.progress_bar.setVisible(False)
+        self.translate_all_btn.setEnabled(True)
+        self.pause_btn.setVisible(False)
+        self.cancel_btn.setVisible(False)
+        self.cancel_btn.setEnabled(True)
+        if self.translation_thread.control.cancelled:
+            status = f"Translation cancelled at {self.progress_bar.value()}%"
+        else:
+            status = "All translations completed"
+        if self.translation_thread.requests_saved:
+            status += f" ({self.translation_thread.requests_saved} duplicate requests saved)"
+        if self.translation_thread.fuzzy_hits:
+            status += f" ({self.translation_thread.fuzzy_hits} reused from near-identical strings)"
+        if self.translation_memory:
+            stats = self.translation_memory.stats()
+            status += (f" (translation memory: {stats['hits']} hits, {stats['misses']} misses, "
+                       f"{stats['hit_rate']:.0%} hit rate)")
+        summary = self.translation_thread.stats.summary()
+        status += f" ({summary['keys_per_second']:.1f} keys/s, {summary['failed_keys']} failed; see Stats)"
+        self.status_label.setText(status)
+        self.refresh_stats()
+        if os.environ.get('TRANSLATOR_STATS_LOG'):
+            try:
+                with open(os.path.join(get_application_path(), STATS_LOG_FILE), 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            except Exception as e:
+                print(f"Could not write translation stats: {str(e)}", file=sys.stderr)
+
+    def show_stats(self):
+        if self.stats_dialog is None:
+            self.stats_dialog = TranslationStatsDialog(self)
+            self.stats_dialog.export_json_btn.clicked.connect(lambda: self.export_stats('json'))
+            self.stats_dialog.export_csv_btn.clicked.connect(lambda: self.export_stats('csv'))
+            self.stats_dialog.profile_btn.toggled.connect(self.toggle_profiling)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+        self.refresh_stats()
+        self.stats_timer.start()
+
+    def refresh_stats(self):
+        """Update the status bar while Translate All runs, and the stats panel while it is open"""
+        # The run's own end, since the thread is still running while its finished signal is handled
+        running = self.stats is not None and self.stats.end is None
+        panel = self.stats_dialog is not None and self.stats_dialog.isVisible()
+        if not running and not panel:
+            self.stats_timer.stop()
+            return
+        summary = self.stats.summary() if self.stats is not None else None
+        if running and not self.translation_thread.control.paused:
+            self.status_label.setText(format_status(summary))
+        if panel:
+            text = format_summary(summary) if summary is not None else "No Translate All run yet"
+            if self.profile_report:
+                text += "\n\n" + self.profile_report
+            self.stats_dialog.show_text(text)
+
+    def export_stats(self, fmt):
+        """Write the current or last run as JSON (summary and every request) or CSV (one row per request)"""
+        if self.stats is None:
+            QMessageBox.information(self, "Translation Stats", "Run Translate All first")
+            return
+        stamp = time.strftime('%Y%m%d_%H%M%S', time.localtime(self.stats.started))
+        file_filter = "JSON files (*.json)" if fmt == 'json' else "CSV files (*.csv)"
+        file_name, _ = QFileDialog.getSaveFileName(self, "Export Translation Stats",
+                                                   f"translation_stats_{stamp}.{fmt}", file_filter)
+        if file_name:
+            try:
+                if fmt == 'json':
+                    self.stats.write_json(file_name)
+                else:
+                    self.stats.write_csv(file_name)
+                self.status_label.setText(f"Exported translation stats to: {file_name}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export stats: {str(e)}")
+
+    def toggle_profiling(self, enabled):
+        """Profile the GUI thread (table updates, painting, searches) between two clicks"""
+        if enabled:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            self.profile_report = "Profiling the GUI thread..."
+        elif self.profiler is not None:
+            self.profiler.disable()
+            path = os.path.join(get_application_path(), PROFILE_FILE)
+            output = io.StringIO()
+            profile = pstats.Stats(self.profiler, stream=output)
+            profile.sort_stats('cumulative').print_stats(25)
+            try:
+                profile.dump_stats(path)
+                saved = f"Full profile saved to {path}"
+            except Exception as e:
+                saved = f"Could not save the profile: {str(e)}"
+            self.profile_report = f"{saved}\n{output.getvalue()}"
+            self.profiler = None
+        self.refresh_stats()
+    
+    def save_translation(self):
+        # Save the active language to a file
+        file_name, _ = QFileDialog.getSaveFileName(self, "Save Translation", "", "JSON files (*.json)")
+        if file_name:
+            try:
+                column = self.store.active
+                if not self._save_column(column, file_name, self.store.source_map()):
+                    self.status_label.setText(f"Saved a copy to: {file_name} ({column.name} itself is not saved)")
+                    return
+                if column.path is None:
+                    column.path = file_name
+                    column.name = os.path.splitext(os.path.basename(file_name))[0]
+                    self.model.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, self.model.columnCount() - 1)
+                    self.refresh_file_combo()
+                self.status_label.setText(f"Saved translation to: {file_name}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save file: {str(e)}")
+
+def main(start_time=None):
+    """Run the GUI; start_time is the perf_counter() value the process started at, if known"""
+    if start_time is not None:
+        startup_timer.start = startup_timer.last = start_time
+    startup_timer.mark("imports")
+    app = QApplication(sys.argv)
+    startup_timer.mark("QApplication")
+    window = TranslatorApp()
+    window.show()
+    QTimer.singleShot(0, window.on_first_paint)
+    sys.exit(app.exec())
@@ -0,0 +1,92 @@
+"""Checks of target language files against en.json, shared by the CLI validator."""
+import os
+import re
+from collections import Counter
+
+from localization import load_flat_json
+from source_manifest import load_manifest, diff_sources
+
+# Markup that clean_html strips or converts; a translation must keep all of it
+_TAG = re.compile(r'<[^>]+>')
+_NEWLINE = re.compile(r'\\n|\n')
+# {0}, {name}, %s, %d, %1$s, %.2f
+# No space flag: "50 % fait" is prose, not a conversion
+_PLACEHOLDER = re.compile(r'\{[^{}\s]*\}|%(?:\d+\$)?[-+#0]*\d*(?:\.\d+)?[sdif]')
+
+# Issues that break the mod (fail validation) and ones that only need a look
+ERRORS = ('missing', 'html', 'newline', 'placeholder')
+WARNINGS = ('extra', 'identical', 'source_changed')
+
+
+def tags(text):
+    return sorted(''.join(tag.split()) for tag in _TAG.findall(text))
+
+
+def placeholders(text):
+    return sorted(_PLACEHOLDER.findall(text))
+
+
+def _mismatch(key, expected, found):
+    """Report entry listing what the source has and the translation lacks, and the reverse"""
+    expected, found = Counter(expected), Counter(found)
+    return {'key': key, 'missing': sorted((expected - found).elements()),
+            'unexpected': sorted((found - expected).elements())}
+
+
+def validate_file(source_path, target_path, sources=None):
+    """Return the issues of one target file as a JSON-serializable report.
+
+    sources is the flattened en.json; it is read from source_path when not given.
+    """
+    lang = os.path.splitext(os.path.basename(target_path))[0]
+    report = {'lang': lang, 'path': target_path}
+    try:
+        if sources is None:
+            sources = load_flat_json(source_path)
+        targets = load_flat_json(target_path)
+    except Exception as e:
+        report['error'] = str(e)
+        report['errors'] = 1
+        report['warnings'] = 0
+        return report
+
+    issues = {name: [] for name in ERRORS + WARNINGS}
+    diff = diff_sources(sources, targets, load_manifest(target_path))
+    issues['missing'] = diff.new
+    issues['source_changed'] = diff.source_changed
+    issues['extra'] = [key for key in targets if key not in sources]
+    for key in diff.unchanged + diff.source_changed:
+        source, target = str(sources[key]), str(targets[key])
+        if target == source:
+            issues['identical'].append(key)
+            continue
+        # Cheap substring tests first; most strings have no markup at all
+        if '<' in source or '<' in target:
+            expected, found = tags(source), tags(target)
+            if expected != found:
+                issues['html'].append(_mismatch(key, expected, found))
+        if source.count('\\n') + source.count('\n') != target.count('\\n') + target.count('\n'):
+            issues['newline'].append({'key': key, 'expected': len(_NEWLINE.findall(source)),
+                                      'found': len(_NEWLINE.findall(target))})
+        if '{' in source or '%' in source or '{' in target or '%' in target:
+            expected, found = placeholders(source), placeholders(target)
+            if expected != found:
+                issues['placeholder'].append(_mismatch(key, expected, found))
+
+    report['keys'] = len(targets)
+    report['errors'] = sum(len(issues[name]) for name in ERRORS)
+    report['warnings'] = sum(len(issues[name]) for name in WARNINGS)
+    report['issues'] = issues
+    return report
+
+
+def validate_files(source_path, target_paths):
+    """validate_file for several targets, reading en.json only once"""
+    sources = load_flat_json(source_path)
+    return [validate_file(source_path, path, sources) for path in target_paths]
+
+
+def language_files(folder, source_name='en.json'):
+    """Paths of the target language files (every other *.json) in a localization folder, by name"""
+    return [os.path.join(folder, file_name) for file_name in sorted(os.listdir(folder))
+            if file_name.endswith('.json') and file_name != source_name]